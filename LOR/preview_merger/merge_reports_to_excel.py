@@ -16,14 +16,17 @@ from pathlib import Path
 from datetime import datetime
 import warnings
 import pandas as pd
+import numpy as np
 import getpass
 import platform
 import argparse
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
 # GAL 25-10-15: needed for regex in _contains_any
 import re
 
 from pandas.errors import ParserWarning
-from openpyxl.formatting.rule import FormulaRule
 from openpyxl.styles import PatternFill
 
 # Silence noisy CSV parser warnings (optional)
@@ -64,6 +67,17 @@ FILES = [
     ("needs_action.csv", "NeedsAction"),   # <<< NEW: prefer the CSV we generate in dry-run
 ]
 
+# Integer columns per sheet; coerced once in main() (whole numbers → int, other text kept)
+INT_COLUMNS = {
+    "Revision_Mismatches": ("UsedRevision", "DiskLatestRevision"),
+    "NeedsAction": ("AuthorFileSize", "StagedFileSize"),
+}
+
+# Date/time columns per sheet; parsed once in main() so the writer gets datetimes
+DATETIME_COLUMNS = {
+    "NeedsAction": ("AuthorFileTime", "StagedFileTime"),
+}
+
 STAMP = datetime.now().strftime("%Y%m%d-%H%M")
 OUT_XLSX_STAMPED = OUT_DIR / f"lorprev_reports-{STAMP}.xlsx"
 OUT_XLSX_FIXED   = OUT_DIR / "lorprev_reports.xlsx"
@@ -76,11 +90,20 @@ print(f"[cfg] Excel out: {OUT_DIR}")
 
 
 
+def _sniff_sep(path: Path, default: str = ",") -> str:
+    """Detect the delimiter from the header line (what sep=None sniffed), else ','."""
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            header = f.readline()
+        return csv.Sniffer().sniff(header, delimiters=",;\t|").delimiter
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return default
+
 def read_csv_safe(path: Path) -> pd.DataFrame:
     """
     Simple robust CSV reader:
     - UTF-8 with BOM support
-    - engine='python' with delimiter sniffing (sep=None)
+    - C engine; delimiter sniffed once from the header line (normally ',')
     - on_bad_lines='skip' to avoid fatal parse errors
     """
     if not path.exists():
@@ -90,8 +113,8 @@ def read_csv_safe(path: Path) -> pd.DataFrame:
         dtype=str,
         keep_default_na=False,
         encoding="utf-8-sig",
-        sep=None,            # auto-detect delimiter
-        engine="python",
+        sep=_sniff_sep(path),
+        engine="c",
         on_bad_lines="skip", # skip malformed rows instead of crashing
         quoting=0            # QUOTE_MINIMAL
     )
@@ -120,6 +143,9 @@ def _pick_key_cols(df):
 def _contains_any(series: pd.Series, needles: tuple[str, ...]) -> pd.Series:
     if series is None:
         return pd.Series(False, index=[])
+    if len(needles) == 1:
+        # single term: plain substring search, no regex and no lowered copy
+        return series.astype(str).str.contains(needles[0], case=False, regex=False, na=False)
     s = series.astype(str).str.lower()
     # use regex OR of all needles, escape spaces with \s* around hyphens
     pattern = "|".join([re.escape(x) for x in needles])
@@ -150,7 +176,7 @@ def _describe_action(row: dict) -> str:
 def _slice_common_cols(df, extra_cols=()):
     cols = ["PreviewName","Key","Revision","Exported","User","Action","Reason","Comment","Status","Path","StagedPath"]
     cols = [c for c in cols + list(extra_cols) if c in df.columns]
-    return df.loc[:, cols].copy()
+    return df.loc[:, cols]  # pd.concat copies anyway
 
 def build_needs_action_df(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
     rows = []
@@ -206,9 +232,11 @@ def build_needs_action_df(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
     needs = pd.concat(rows, ignore_index=True)
 
     # Normalize and synthesize ActionNeeded
-    for c in ("PreviewName","Key","Revision","Exported","User","Action","Reason","Comment","Status","Path","StagedPath"):
-        if c in needs.columns:
-            needs[c] = needs[c].map(_norm)
+    # (positional: ledger extra columns can repeat a name, e.g. Comment)
+    norm_cols = {"PreviewName","Key","Revision","Exported","User","Action","Reason","Comment","Status","Path","StagedPath"}
+    for i, c in enumerate(needs.columns):
+        if c in norm_cols:
+            needs.isetitem(i, needs.iloc[:, i].astype(str).str.strip())
 
     needs["ActionNeeded"] = needs.apply(lambda r: _describe_action(r.to_dict()), axis=1)
 
@@ -217,24 +245,18 @@ def build_needs_action_df(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
     id_col = key_col or name_col
     if id_col:
         # prefer higher Revision, then newer Exported if present
-        def _rev_int(x):
-            try: return int(str(x).strip())
-            except: return -1
-        def _to_dt(x):
-            from datetime import datetime
-            s = str(x)
-            for fmt in ("%Y-%m-%d %H:%M:%S","%Y-%m-%d %H:%M","%m/%d/%Y %H:%M","%Y-%m-%d"):
-                try: return datetime.strptime(s, fmt)
-                except: pass
-            return None
-        needs["_rev"] = needs.get("Revision", "").map(_rev_int) if "Revision" in needs.columns else -1
-        needs["_exp"] = needs.get("Exported", "").map(_to_dt) if "Exported" in needs.columns else None
-        needs = (
-            needs.sort_values(by=[id_col, "_rev", "_exp"], ascending=[True, False, False], na_position="last")
-                 .drop_duplicates(subset=[id_col], keep="first")
-        )
-        if "_rev" in needs.columns: needs.drop(columns=["_rev"], inplace=True)
-        if "_exp" in needs.columns: needs.drop(columns=["_exp"], inplace=True)
+        if "Revision" in needs.columns:
+            needs["_rev"] = pd.to_numeric(needs["Revision"], errors="coerce").fillna(-1)
+        else:
+            needs["_rev"] = -1
+        if "Exported" in needs.columns:
+            needs["_exp"] = pd.to_datetime(needs["Exported"], format="mixed", errors="coerce").fillna(pd.Timestamp.min)
+        else:
+            needs["_exp"] = pd.Timestamp.min
+        # keep only rows at the best Revision for their id, then the newest Exported among those
+        top = needs[needs["_rev"] == needs.groupby(id_col)["_rev"].transform("max")]
+        needs = needs.loc[top.groupby(id_col)["_exp"].idxmax()]
+        needs.drop(columns=["_rev", "_exp"], inplace=True)
 
     # Final column order
     ordered = [c for c in ("PreviewName","Key","Revision","Exported","User","ActionNeeded","Action","Reason","Comment","Path","StagedPath") if c in needs.columns]
@@ -253,12 +275,11 @@ def annotate_ledger_with_needs_action(tables: dict[str, pd.DataFrame], needs: pd
 
     # Map id -> ActionNeeded
     by_id = {}
-    if key_col and key_col in needs.columns:
-        for i, row in needs.iterrows():
-            by_id[_norm(row[key_col])] = row.get("ActionNeeded","Needs action")
-    elif name_col and name_col in needs.columns:
-        for i, row in needs.iterrows():
-            by_id[_norm(row[name_col])] = row.get("ActionNeeded","Needs action")
+    needs_id_col = key_col if key_col and key_col in needs.columns else (
+        name_col if name_col and name_col in needs.columns else None)
+    if needs_id_col:
+        actions = needs["ActionNeeded"] if "ActionNeeded" in needs.columns else ["Needs action"] * len(needs)
+        by_id = dict(zip(needs[needs_id_col].astype(str).str.strip(), actions))
 
     # Ensure Comment column exists
     if "Comment" not in ledger.columns:
@@ -266,12 +287,11 @@ def annotate_ledger_with_needs_action(tables: dict[str, pd.DataFrame], needs: pd
 
     # Apply annotations
     if key_col and key_col in ledger.columns:
-        ids = ledger[key_col].map(_norm)
+        ids = ledger[key_col].astype(str).str.strip()
     else:
-        ids = ledger[name_col].map(_norm)
+        ids = ledger[name_col].astype(str).str.strip()
 
-    def _merge_comment(idx, old):
-        aid = by_id.get(_norm(ids.iloc[idx]))
+    def _merge_comment(aid, old):
         if not aid:
             return old
         if not old:
@@ -281,266 +301,301 @@ def annotate_ledger_with_needs_action(tables: dict[str, pd.DataFrame], needs: pd
             return old  # don't duplicate
         return f"{old}; Needs action — {aid}"
 
-    ledger["Comment"] = [ _merge_comment(i, _norm(v)) for i, v in enumerate(ledger["Comment"]) ]
+    comments = ledger["Comment"].astype(str).str.strip()
+    ledger["Comment"] = [ _merge_comment(by_id.get(i), old) for i, old in zip(ids, comments) ]
     tables["Current_Previews_Ledger"] = ledger
 # ---------------------------------------------------------------------------
 
 # ---------------------------------------------------------------------------
 # GAL 25-10-15: Excel formatting helpers (openpyxl)
 # ---------------------------------------------------------------------------
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Alignment
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.styles import Alignment, Border, Font, Side
+
+# Same header look pandas' to_excel used to give us
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(*(Side(style="thin"),) * 4)
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="top")
 
 def _header_map(ws, header_row: int = 1) -> dict[str, str]:
-    """Map normalized header text -> column letter."""
-    m = {}
-    for cell in ws[header_row]:
-        if cell.value:
-            m[str(cell.value).strip().lower()] = cell.column_letter
-    return m
+    """
+    Map normalized header text -> column letter.
+    Cached on the worksheet (headers are never rewritten after the data is
+    written), so repeated header lookups don't rescan the header row.
+    Write-only sheets can't be read back; _write_sheet primes their cache.
+    """
+    cache = getattr(ws, "_gal_hdr", None)
+    if cache is None:
+        cache = ws._gal_hdr = {}
+    if header_row not in cache:
+        cache[header_row] = {
+            str(cell.value).strip().lower(): cell.column_letter
+            for cell in ws[header_row] if cell.value
+        }
+    return cache[header_row]
 
 def _col_letter_for(ws, header_name: str, header_row: int = 1) -> str | None:
     """Find column letter by header (case-insensitive)."""
     hmap = _header_map(ws, header_row)
     return hmap.get(str(header_name).strip().lower())
 
+def _register_column_format(ws, col: str, number_format: str, horizontal: str, convert) -> None:
+    """
+    Write-only sheets can't be restyled once rows are appended, so formats are
+    registered per column up front and applied by _append_rows as each row is
+    streamed. convert(value) returns the value to write with the format, or
+    None to leave the cell as-is.
+    """
+    fmts = getattr(ws, "_gal_fmt", None)
+    if fmts is None:
+        fmts = ws._gal_fmt = {}
+    idx = column_index_from_string(col) - 1
+    fmts[idx] = (number_format, Alignment(horizontal=horizontal), convert)
+
+def _is_number(v) -> bool:
+    return isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool)
+
+def _numeric_only(v):
+    return v if _is_number(v) else None
+
 def _number_format_int(ws, headers: list[str], header_row: int = 1) -> None:
     """
     GAL 25-10-15
     Format given header columns as integers (format '0').
     Ignores missing columns gracefully.
+    Values are not coerced here; main() converts the columns with
+    pd.to_numeric (see INT_COLUMNS) so only real numbers get the format.
     """
     for h in headers:
         col = _col_letter_for(ws, h, header_row)
-        if not col:
-            continue
-        for r in range(header_row + 1, ws.max_row + 1):
-            c = ws[f"{col}{r}"]
-            # only set format if the cell looks numeric
-            try:
-                if c.value is None:
-                    continue
-                # coerce strings like "42" to number visually
-                if isinstance(c.value, str) and c.value.isdigit():
-                    c.value = int(c.value)
-                if isinstance(c.value, (int, float)):
-                    c.number_format = "0"
-                    c.alignment = Alignment(horizontal="right")
-            except Exception:
-                pass
+        if col:
+            _register_column_format(ws, col, "0", "right", _numeric_only)
 
 def _number_format_float(ws, headers: list[str], header_row: int = 1, decimals: int = 2) -> None:
-    """Format columns as floats with a fixed number of decimals."""
+    """Format numeric columns as floats with a fixed number of decimals (coerce first)."""
     fmt = "0." + "0" * max(0, decimals)
     for h in headers:
         col = _col_letter_for(ws, h, header_row)
-        if not col:
-            continue
-        for r in range(header_row + 1, ws.max_row + 1):
-            c = ws[f"{col}{r}"]
-            try:
-                if c.value is None:
-                    continue
-                if isinstance(c.value, str):
-                    try:
-                        c.value = float(c.value)
-                    except Exception:
-                        continue
-                if isinstance(c.value, (int, float)):
-                    c.number_format = fmt
-                    c.alignment = Alignment(horizontal="right")
-            except Exception:
-                pass
+        if col:
+            _register_column_format(ws, col, fmt, "right", _numeric_only)
+
+def _datetime_only(v):
+    return v if isinstance(v, datetime) else None
 
 def _number_format_datetime(ws, headers: list[str], header_row: int = 1) -> None:
     """
-    Format date/time looking columns as 'yyyy-mm-dd hh:mm'.
-    Leaves text that can’t be parsed.
+    Format date/time columns as 'yyyy-mm-dd hh:mm'.
+    Values are parsed once per column in main() (see DATETIME_COLUMNS);
+    text that doesn't parse stays a string there and is written unformatted.
     """
-    fmt = "yyyy-mm-dd hh:mm"
-    # quick parser without external deps
-    from datetime import datetime
-    fmts_try = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M",
-                "%m/%d/%Y %H:%M", "%Y-%m-%d")
     for h in headers:
         col = _col_letter_for(ws, h, header_row)
-        if not col:
-            continue
-        for r in range(header_row + 1, ws.max_row + 1):
-            c = ws[f"{col}{r}"]
-            v = c.value
-            try:
-                if v is None:
-                    continue
-                if isinstance(v, str):
-                    dt = None
-                    for f in fmts_try:
-                        try:
-                            dt = datetime.strptime(v.strip(), f)
-                            break
-                        except Exception:
-                            pass
-                    if dt is None:
-                        continue
-                    c.value = dt
-                # openpyxl will handle python datetime types
-                c.number_format = fmt
-                c.alignment = Alignment(horizontal="left")
-            except Exception:
-                pass
-
-def _auto_width(ws, header_row: int = 1, max_width: int = 60) -> None:
-    """Autosize columns based on header + cell content length."""
-    for col_cells in ws.columns:
-        col_letter = get_column_letter(col_cells[0].column)
-        try:
-            lengths = [len(str(c.value)) if c.value is not None else 0 for c in col_cells]
-            width = min(max_width, max(lengths + [10]) + 2)
-            ws.column_dimensions[col_letter].width = width
-        except Exception:
-            pass
-
+        if col:
+            _register_column_format(ws, col, "yyyy-mm-dd hh:mm", "left", _datetime_only)
 
-def autosize_and_filter(ws):
-    """Freeze header, add autofilter, and auto-fit columns (capped width)."""
+def finalize_sheet(ws, df: pd.DataFrame, max_width: int = 80) -> None:
+    """
+    Freeze header, add autofilter, and auto-fit columns (capped width) in a
+    single walk over the columns.
+    Widths come from the DataFrame: write-only sheets need them set before
+    the first row is appended.
+    """
     ws.freeze_panes = "A2"
-    if ws.max_row >= 1 and ws.max_column >= 1:
-        ws.auto_filter.ref = ws.dimensions
-    for col in ws.columns:
-        col_letter = col[0].column_letter
-        max_len = 0
-        for cell in col:
-            val = "" if cell.value is None else str(cell.value)
-            if len(val) > max_len:
-                max_len = len(val)
-        ws.column_dimensions[col_letter].width = min(max(10, max_len + 2), 80)
-
-def _choose_action_like_column(ws, header_row=1):
+    ncols = max(1, len(df.columns))
+    ws.auto_filter.ref = f"A1:{get_column_letter(ncols)}{len(df) + 1}"
+    if df.empty:
+        cell_lens = np.zeros(len(df.columns), dtype=int)
+    else:
+        # longest str(value) per column, computed column-wise (empty cells count as 0)
+        text = df.astype(str).where(df.notna(), "")
+        cell_lens = text.apply(lambda c: c.str.len().max()).to_numpy(dtype=int)
+    widths = np.maximum(df.columns.astype(str).str.len().to_numpy(), cell_lens)
+    for i, w in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = min(max(10, int(w) + 2), max_width)
+
+# Status-ish words used to score candidate columns in _choose_action_like_column
+_SCORE_RE = re.compile(
+    "applied|update-staging|stage-new|ready to apply|out-of-date|"
+    "blocked|error|fail|excluded|skip|identical|no-op",
+    re.IGNORECASE,
+)
+
+def _choose_action_like_column(ws, df: pd.DataFrame, header_row=1):
     """
     GAL 25-10-15: Prefer deterministic columns; fall back to heuristic.
+    Header text and sample values come from the sheet's DataFrame.
     """
     title = ws.title
-    # Prefer the mapped column if present
+    # Both the preferred lookup and the fallback use the cached header map
+    hmap = _header_map(ws, header_row)
+
+    def _text(letter):
+        return str(df.columns[column_index_from_string(letter) - 1]).strip()
+
+    # Prefer the mapped column if present (exact header match, case-insensitive)
     preferred = STATUS_COLUMN_MAP.get(title)
-    if preferred:
-        # Find exact header match (case-insensitive)
-        for cell in ws[header_row]:
-            if cell.value and str(cell.value).strip().lower() == preferred.lower():
-                return cell.column_letter, str(cell.value).strip()
+    if preferred and preferred.lower() in hmap:
+        letter = hmap[preferred.lower()]
+        return letter, _text(letter)
 
     # Heuristic fallback (previous behavior)
-    headers = [(cell.column_letter, str(cell.value).strip())
-               for cell in ws[header_row] if cell.value]
-    norm = [(col, txt, txt.lower()) for col, txt in headers]
-    candidates = [(c, t, tl) for c, t, tl in norm if "date" not in tl and "time" not in tl]
+    candidates = [(letter, tl) for tl, letter in hmap.items() if "date" not in tl and "time" not in tl]
 
     # Upgrade priority to include ActionNeeded
     priority = ("actionneeded", "status", "action", "result", "decision", "outcome", "operation", "comment")
 
     def score_col(letter):
         hits = 0
-        max_row = min(ws.max_row, 400)
-        for r in range(2, max_row + 1):
-            v = ws[f"{letter}{r}"].value
-            if not v:
-                continue
-            s = str(v).lower()
-            if any(t in s for t in ("applied", "update-staging", "stage-new", "ready to apply", "out-of-date",
-                                     "blocked", "error", "fail", "excluded", "skip", "identical", "no-op")):
+        # rows 2..400 of the sheet, as raw values (no cells to read back on write-only sheets)
+        for v in df.iloc[:399, column_index_from_string(letter) - 1].to_numpy():
+            if v and _SCORE_RE.search(str(v)):
                 hits += 1
         return hits
 
     for key in priority:
-        for col, txt, tl in candidates:
+        for col, tl in candidates:
             if key in tl:
-                return col, txt
+                return col, _text(col)
 
-    scored = [(score_col(col), col, txt) for col, txt, _ in candidates]
+    scored = [(score_col(col), col) for col, _ in candidates]
     if scored:
         scored.sort(reverse=True)
         if scored[0][0] > 0:
-            return scored[0][1], scored[0][2]
+            return scored[0][1], _text(scored[0][1])
 
     return None, None
 
 
-def add_action_colors(ws, header_row=1):
-    """Apply conditional colors to the most action/status-like column on this sheet."""
-    from openpyxl.formatting.rule import FormulaRule
-    from openpyxl.styles import PatternFill
+def _solid_fill(color: str) -> PatternFill:
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+def _contains_rule(terms: tuple[str, ...], color: str):
+    """(regex, fill) pair: case-insensitive 'cell contains any term', like SEARCH()."""
+    rx = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE)
+    return rx, _solid_fill(color)
+
+# Action/status colors, checked in order; first match wins
+_ACTION_COLOR_RULES = [
+    _contains_rule(("applied", "update-staging", "allow", "allowed", "pass", "passed"), "C6EFCE"),   # light green
+    _contains_rule(("ready to apply",), "FFF2CC"),                                                  # light yellow
+    _contains_rule(("blocked", "error", "fail", "failed", "exclude", "excluded", "work needed"), "FFC7CE"),  # light red
+    _contains_rule(("skip", "identical", "no-op", "not needed", "unchanged"), "E7E6E6"),            # light gray
+]
+
+def _register_column_fills(ws, col: str, rules) -> None:
+    """
+    Static fills for a write-only sheet, applied by _append_rows as rows are
+    streamed. rules is a list of (regex, PatternFill); the first rule whose
+    regex matches str(value) colors the cell. Rules registered earlier keep
+    priority, as the conditional-format rules they replace did.
+    """
+    fills = getattr(ws, "_gal_fill", None)
+    if fills is None:
+        fills = ws._gal_fill = {}
+    idx = column_index_from_string(col) - 1
+    fills.setdefault(idx, []).extend(rules)
 
-    col_letter, header_text = _choose_action_like_column(ws, header_row=header_row)
-    if not col_letter or ws.max_row <= header_row:
+def add_action_colors(ws, df: pd.DataFrame, header_row=1):
+    """
+    Color the most action/status-like column on this sheet.
+    Cells are filled as they are written instead of through conditional
+    formatting, so Excel has no rules to evaluate when the workbook opens.
+    """
+    col_letter, header_text = _choose_action_like_column(ws, df, header_row=header_row)
+    if not col_letter or df.empty:
         return
 
-    rng = f"${col_letter}${header_row+1}:${col_letter}${ws.max_row}"
-    top_left = f"{col_letter}{header_row+1}"  # e.g., D2 (row-relative)
-
-    def any_of(cell_ref, terms):
-        parts = [f'ISNUMBER(SEARCH("{t}",{cell_ref}))' for t in terms]
-        return f"OR({','.join(parts)})"
-
-    # Rules
-    green  = any_of(top_left, ("applied", "update-staging", "allow", "allowed", "pass", "passed"))
-    yellow = any_of(top_left, ("ready to apply",))
-    red    = any_of(top_left, ("blocked", "error", "fail", "failed", "exclude", "excluded", "work needed"))
-    gray   = any_of(top_left, ("skip", "identical", "no-op", "not needed", "unchanged"))
-
-    for formula, color in (
-        (green,  "C6EFCE"),   # light green
-        (yellow, "FFF2CC"),   # light yellow
-        (red,    "FFC7CE"),   # light red
-        (gray,   "E7E6E6"),   # light gray
-    ):
-        ws.conditional_formatting.add(
-            rng,
-            FormulaRule(
-                formula=[formula],
-                fill=PatternFill(start_color=color, end_color=color, fill_type="solid"),
-            ),
-        )
+    _register_column_fills(ws, col_letter, _ACTION_COLOR_RULES)
 
     # Optional: keep this if you like the console hint
     print(f"[format] {ws.title}: using '{header_text}' column for color rules")
 
-def add_missing_comments_colors(ws, header_row=1):
+# Missing_Comments: which headers get colored, and how (first match wins)
+_MISSING_STATUS_HEADER_RE = re.compile(r"status|need|missing|reason|comment", re.IGNORECASE)
+_MISSING_COLOR_RULES = [
+    _contains_rule(("needs", "missing", "blocked"), "FFC7CE"),   # light red
+    _contains_rule(("ok", "clean", "complete"), "C6EFCE"),       # light green
+]
+
+def add_missing_comments_colors(ws, df: pd.DataFrame, header_row=1):
     """
     Highlight status-like columns in Missing_Comments:
     - Red if cell contains: needs / missing / blocked
     - Green if cell contains: ok / clean / complete
     Candidate columns: headers containing status/need/missing/reason/comment
+    Filled at write time like add_action_colors (which keeps priority).
     """
-    # Identify candidate columns by header keywords
-    status_cols = []
-    for cell in ws[header_row]:
-        if not cell.value:
-            continue
-        name = str(cell.value).strip().lower()
-        if any(key in name for key in ("status", "need", "missing", "reason", "comment")):
-            status_cols.append(cell.column_letter)
-
-    if not status_cols or ws.max_row <= header_row:
+    if df.empty:
         return
+    for i, header in enumerate(df.columns, start=1):
+        if header and _MISSING_STATUS_HEADER_RE.search(str(header)):
+            _register_column_fills(ws, get_column_letter(i), _MISSING_COLOR_RULES)
+
+def _append_rows(ws, df: pd.DataFrame) -> None:
+    """Stream the header and data rows, applying any registered column formats."""
+    header = []
+    for name in df.columns:
+        cell = WriteOnlyCell(ws, value=str(name))
+        cell.font, cell.border, cell.alignment = _HEADER_FONT, _HEADER_BORDER, _HEADER_ALIGN
+        header.append(cell)
+    ws.append(header)
+
+    fmts = getattr(ws, "_gal_fmt", None) or {}
+    fills = getattr(ws, "_gal_fill", None) or {}
+    styled = sorted(set(fmts) | set(fills))
+    for row in df.itertuples(index=False, name=None):
+        if styled:
+            row = list(row)
+            for idx in styled:
+                v = row[idx]
+                if v is None:
+                    continue
+                cell = None
+                if idx in fmts:
+                    number_format, alignment, convert = fmts[idx]
+                    cv = convert(v)
+                    if cv is not None:
+                        cell = WriteOnlyCell(ws, value=cv)
+                        cell.number_format = number_format
+                        cell.alignment = alignment
+                for rx, fill in fills.get(idx, ()):
+                    if rx.search(str(v)):
+                        if cell is None:
+                            cell = WriteOnlyCell(ws, value=v)
+                        cell.fill = fill
+                        break
+                if cell is not None:
+                    row[idx] = cell
+        ws.append(row)
+
+def _write_sheet(wb, sheet_name: str, df: pd.DataFrame):
+    """
+    Write one DataFrame as a streaming (write-only) sheet.
+    Everything that depends on the data (widths, color rules, number formats)
+    is decided from the DataFrame before the rows are appended.
+    """
+    ws = wb.create_sheet(sheet_name)
+    # NaN/NA/NaT -> empty cells, the same as to_excel
+    values = df.astype(object).where(df.notna(), None)
+    ws._gal_hdr = {1: {str(name).strip().lower(): get_column_letter(i)
+                       for i, name in enumerate(df.columns, start=1) if name}}
 
-    last = ws.max_row
-    for col_letter in status_cols:
-        rng = f"${col_letter}${header_row+1}:${col_letter}${last}"
-        # Red for needs/missing/blocked
-        ws.conditional_formatting.add(
-            rng,
-            FormulaRule(
-                formula=[f'OR(ISNUMBER(SEARCH("needs",$${col_letter}{header_row+1})),ISNUMBER(SEARCH("missing",$${col_letter}{header_row+1})),ISNUMBER(SEARCH("blocked",$${col_letter}{header_row+1})))'.replace("$$","$")],
-                fill=PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            )
-        )
-        # Green for ok/clean/complete
-        ws.conditional_formatting.add(
-            rng,
-            FormulaRule(
-                formula=[f'OR(ISNUMBER(SEARCH("ok",$${col_letter}{header_row+1})),ISNUMBER(SEARCH("clean",$${col_letter}{header_row+1})),ISNUMBER(SEARCH("complete",$${col_letter}{header_row+1})))'.replace("$$","$")],
-                fill=PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-            )
-        )
+    finalize_sheet(ws, values)
+    if sheet_name not in ("Overview", "Info"):
+        add_action_colors(ws, values)
+    if sheet_name == "Missing_Comments":
+        add_missing_comments_colors(ws, values)
+
+    if sheet_name in INT_COLUMNS:
+        _number_format_int(ws, list(INT_COLUMNS[sheet_name]))
+
+    if sheet_name in DATETIME_COLUMNS:
+        _number_format_datetime(ws, list(DATETIME_COLUMNS[sheet_name]))
+
+    _append_rows(ws, values)
+    return ws
 
 # ---------------------------------------------------------------------------
 # GAL 25-10-15: Deterministic Overview — fixed status columns per sheet
@@ -559,29 +614,30 @@ STATUS_COLUMN_MAP = {
     "NeedsAction": "ActionNeeded",        # synthesized action we created
 }
 
-def _normalize_status_value(raw: str) -> str:
+# Overview buckets, checked in order; first match wins (see _normalize_status_series)
+_STATUS_BUCKETS = [
+    ("applied",        ("applied", "applies ok")),
+    ("update-staging", ("update-staging", "replace staged", "winner newer", "semantic different")),
+    ("stage-new",      ("stage-new", "not staged", "missing in staging")),
+    ("ready to apply", ("ready to apply",)),
+    ("out-of-date",    ("out-of-date",)),
+    ("blocked/error",  ("blocked", "error", "fail", "failed", "exclude", "excluded", "work needed")),
+    ("skip/identical", ("skip", "identical", "no-op", "unchanged", "not needed")),
+]
+_STATUS_BUCKET_RES = [
+    (label, re.compile("|".join(re.escape(t) for t in terms)))
+    for label, terms in _STATUS_BUCKETS
+]
+
+def _normalize_status_series(series: pd.Series) -> pd.Series:
     """GAL 25-10-15: collapse noisy text into consistent buckets for Overview."""
-    s = ("" if raw is None else str(raw)).strip().lower()
-    if not s or s == "(blank)":
-        return "(blank)"
-
-    # common buckets
-    if any(t in s for t in ("applied", "applies ok")):
-        return "applied"
-    if any(t in s for t in ("update-staging", "replace staged", "winner newer", "semantic different")):
-        return "update-staging"
-    if "stage-new" in s or "not staged" in s or "missing in staging" in s:
-        return "stage-new"
-    if "ready to apply" in s:
-        return "ready to apply"
-    if "out-of-date" in s:
-        return "out-of-date"
-    if any(t in s for t in ("blocked", "error", "fail", "failed", "exclude", "excluded", "work needed")):
-        return "blocked/error"
-    if any(t in s for t in ("skip", "identical", "no-op", "unchanged", "not needed")):
-        return "skip/identical"
+    s = series.astype(str).str.strip().str.lower()
+    conds = [s.eq("") | s.eq("(blank)")]
+    conds += [s.str.contains(rx, regex=True, na=False) for _, rx in _STATUS_BUCKET_RES]
+    labels = ["(blank)"] + [label for label, _ in _STATUS_BUCKET_RES]
     # otherwise keep a short form (first 40 chars) so we don’t flood the overview
-    return s[:40]
+    short = s.str.slice(0, 40).to_numpy(dtype=object)
+    return pd.Series(np.select(conds, labels, default=short), index=series.index)
 
 def build_overview(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
     """
@@ -597,9 +653,8 @@ def build_overview(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
         if col not in df.columns or df.empty:
             continue
 
-        series = df[col].astype(str).replace({"": "(blank)"})
         counts = (
-            series.map(_normalize_status_value)
+            _normalize_status_series(df[col])
                   .value_counts(dropna=False)
                   .rename_axis("Value")
                   .reset_index(name="Count")
@@ -625,6 +680,7 @@ def build_overview(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
 from datetime import datetime
 from pathlib import Path
 import os, json, getpass, platform, socket
+from functools import lru_cache
 import pandas as pd
 
 def _who_am_i():
@@ -632,20 +688,34 @@ def _who_am_i():
     host = os.getenv("COMPUTERNAME") or platform.node() or socket.gethostname() or "unknown"
     return user, host, f"{user}@{host}"
 
+try:
+    import orjson  # optional, faster JSON decode
+except ImportError:
+    orjson = None
+
+@lru_cache(maxsize=8)
+def _read_run_meta(base: str):
+    """Decoded run_meta.json in base, or None if there isn't one. Cached per folder."""
+    meta_path = Path(base) / "run_meta.json"
+    if not meta_path.exists():
+        return None
+    raw = meta_path.read_bytes()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
 def _load_run_meta(candidates):
     for base in candidates:
         try:
             if not base:
                 continue
-            meta_path = Path(base) / "run_meta.json"
-            if meta_path.exists():
-                return json.loads(meta_path.read_text(encoding="utf-8"))
+            meta = _read_run_meta(str(base))
+            if meta is not None:
+                return meta
         except Exception:
             pass
     return {}
 
 def write_info_tab(
-    writer,
+    wb,
     tables=None,
     root=None,
     compare_summary=None,
@@ -700,17 +770,27 @@ def write_info_tab(
     except Exception as e:
         print(f"[WARN] Info tab: could not compute LedgerRows: {e}")
 
-    pd.DataFrame([info_row]).to_excel(writer, index=False, sheet_name="Info")
+    _write_sheet(wb, "Info", pd.DataFrame([info_row]))
     print("[GAL 25-10-20] Info tab written with RunMode/Reason/User/Machine/Actor")
 
 def main():
     tables = {}
-    for filename, sheet in FILES:
-        df = read_csv_safe(ROOT / filename)
-        if sheet == "Revision_Mismatches":
-            for col in ("UsedRevision", "DiskLatestRevision"):
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")  # nullable int, no decimals
+    # Read the report CSVs concurrently (I/O-bound on the shared drive);
+    # results are consumed in FILES order so the sheet order is unchanged.
+    with ThreadPoolExecutor(max_workers=len(FILES)) as ex:
+        frames = list(ex.map(read_csv_safe, [ROOT / filename for filename, _ in FILES]))
+    for (filename, sheet), df in zip(FILES, frames):
+        for col in INT_COLUMNS.get(sheet, ()):
+            if col in df.columns:
+                nums = pd.to_numeric(df[col], errors="coerce")
+                nums = nums.where(nums == nums.round())  # whole numbers only
+                # ints where the text is a whole number; anything else keeps its original text
+                df[col] = nums.astype("Int64").astype(object).where(nums.notna(), df[col])
+        for col in DATETIME_COLUMNS.get(sheet, ()):
+            if col in df.columns:
+                parsed = pd.to_datetime(df[col], format="mixed", errors="coerce")
+                # text that doesn't parse stays as the original string (not NaT)
+                df[col] = parsed.astype(object).where(parsed.notna(), df[col])
         if df is not None and not df.empty:
             tables[sheet] = df
 
@@ -757,52 +837,41 @@ def main():
 
 
 
-    with pd.ExcelWriter(OUT_XLSX_STAMPED, engine="openpyxl") as writer:
-        # ---- Write Overview + Info FIRST so they appear at the front ----
-        overview = build_overview(tables)
-        overview.to_excel(writer, index=False, sheet_name="Overview")
-        write_info_tab(
-            writer,
-            tables=tables,                 # your dict of DataFrames used for other sheets
-            root=args.root,                # the --root path you already parse
-            compare_summary=compare_summary if 'compare_summary' in locals() else None,
-            run_mode=run_mode if 'run_mode' in locals() else None,
-            actor=actor if 'actor' in locals() else None
-)
-
-
-        # ---- Now write the normal report tabs ----
-        for sheet_name, df in tables.items():
-            df.to_excel(writer, index=False, sheet_name=sheet_name)
+    # Write-only workbook: rows are streamed to disk as each sheet is written
+    # instead of holding every cell object in memory until save.
+    wb = Workbook(write_only=True)
 
-        # ---- Post-format all sheets (keep your existing helpers/calls) ----
-        wb = writer.book
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            autosize_and_filter(ws)
-            if sheet_name not in ("Overview", "Info"):
-                add_action_colors(ws)
-            if sheet_name == "Missing_Comments":
-                add_missing_comments_colors(ws)
-        
-            if sheet_name == "Revision_Mismatches":
-                _number_format_int(ws, ["UsedRevision", "DiskLatestRevision"])
-
-            # NeedsAction sheet: datetime + size formatting
-            if sheet_name == "NeedsAction":
-                _number_format_datetime(ws, ["AuthorFileTime", "StagedFileTime"])
-                _number_format_int(ws, ["AuthorFileSize", "StagedFileSize"])
+    # ---- Write Overview + Info FIRST so they appear at the front ----
+    overview = build_overview(tables)
+    _write_sheet(wb, "Overview", overview)
+    write_info_tab(
+        wb,
+        tables=tables,                 # your dict of DataFrames used for other sheets
+        root=args.root,                # the --root path you already parse
+        compare_summary=compare_summary if 'compare_summary' in locals() else None,
+        run_mode=run_mode if 'run_mode' in locals() else None,
+        actor=actor if 'actor' in locals() else None
+    )
 
-        # Make Overview the active sheet when the workbook opens
-        if "Overview" in wb.sheetnames:
-            wb.active = wb.sheetnames.index("Overview")
+    # ---- Now write the normal report tabs (formatted as they are written) ----
+    for sheet_name, df in tables.items():
+        _write_sheet(wb, sheet_name, df)
 
+    # Make Overview the active sheet when the workbook opens
+    if "Overview" in wb.sheetnames:
+        wb.active = wb.sheetnames.index("Overview")
 
+    # Save once to memory and write the same bytes to both targets
+    # (no re-read of the just-written file from the shared drive)
+    buf = io.BytesIO()
+    wb.save(buf)
+    data = buf.getvalue()
+    OUT_XLSX_STAMPED.write_bytes(data)
     print(f"[OK] Wrote Excel (timestamped): {OUT_XLSX_STAMPED}")
 
     # Best-effort copy to fixed name (skip if locked/open)
     try:
-        OUT_XLSX_FIXED.write_bytes(OUT_XLSX_STAMPED.read_bytes())
+        OUT_XLSX_FIXED.write_bytes(data)
         print(f"[OK] Also wrote: {OUT_XLSX_FIXED}")
     except PermissionError:
         print(f"[WARN] Could not overwrite {OUT_XLSX_FIXED} (file in use). Using timestamped output.")
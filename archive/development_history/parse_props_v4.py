@@ -10,27 +10,87 @@
 # 0.1.4 
 
 
-import xml.etree.ElementTree as ET
+try:
+    from lxml import etree as ET  # same iterparse API, faster tokenizer
+    # lxml can drop the events for other tags (shape, point, ...) in C
+    _ITERPARSE_TAGS = {"tag": ("PreviewClass", "PropClass")}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _ITERPARSE_TAGS = {}
+import argparse
+import hashlib
+import logging
+import multiprocessing
 import os
+import re
 import sqlite3
 from collections import defaultdict
 
-def initialize_database():
-    # Connect to the database (do not delete the file)
-    conn = sqlite3.connect("LOR.db")
+log = logging.getLogger(__name__)
+LOG_FORMAT = "%(levelname)s: %(message)s"
+
+_STAGE_RE = re.compile(r"Stage (\d{2})")
+
+# props table column order; parse_file builds INSERT-ready tuples in this order
+PROP_COLS = (
+    "PropID", "Name", "LORComment", "DeviceType", "MaxChannels", "Tag", "Network", "UID",
+    "StartChannel", "EndChannel", "Unknown", "Color", "Lights", "DimmingCurveName", "Segments",
+    "Opacity", "MasterDimmable", "PreviewBulbSize", "BulbShape", "CustomBulbColor",
+    "StartLocation", "StringType", "TraditionalColors", "TraditionalType", "RgbOrder",
+    "SeparateIds", "EffectBulbSize", "IndividualChannels", "LegacySequenceMethod",
+    "MasterPropId", "PreviewId",
+)
+PROP_SQL = (
+    "INSERT OR IGNORE INTO props (" + ", ".join(PROP_COLS) + ") "
+    "VALUES (" + ", ".join("?" * len(PROP_COLS)) + ")"
+)
+# Values used when a branch doesn't set a column (everything else is NULL)
+PROP_DEFAULTS = {
+    "MaxChannels": 0, "Lights": 0, "Segments": 0, "Opacity": 0.0, "MasterDimmable": False,
+    "PreviewBulbSize": 0.0, "EffectBulbSize": 0.0, "IndividualChannels": False,
+}
+
+def _prop_row(**fields):
+    """One props row as a tuple in PROP_COLS order."""
+    get = fields.get
+    return tuple(get(col, PROP_DEFAULTS.get(col)) for col in PROP_COLS)
+
+def initialize_database(rebuild=False):
+    # Connect to the database (do not delete the file). Transactions are
+    # managed explicitly: the whole rebuild is one BEGIN IMMEDIATE ... COMMIT
+    conn = sqlite3.connect("LOR.db", isolation_level=None)
     cursor = conn.cursor()
 
-    # Drop existing tables and views
-    cursor.execute("DROP VIEW IF EXISTS LORProps")
-    cursor.execute("DROP TABLE IF EXISTS dmxChannels")
-    cursor.execute("DROP TABLE IF EXISTS subProps")
-    cursor.execute("DROP TABLE IF EXISTS props")
-    cursor.execute("DROP TABLE IF EXISTS previews")
+    # WAL lets the reporting scripts keep reading the previous snapshot
+    # while the rebuild is being written instead of blocking on it
+    cursor.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-131072;
+    """)
+
+    cursor.execute("BEGIN IMMEDIATE")
+
+    # Only start from empty tables when asked to, or when the DB predates the
+    # loaded_files bookkeeping (including its IgnoredRows column); otherwise
+    # process_folder reloads just the files that changed since the last run
+    has_bookkeeping = cursor.execute(
+        "SELECT 1 FROM pragma_table_info('loaded_files') WHERE name = 'IgnoredRows'"
+    ).fetchone()
+    if rebuild or not has_bookkeeping:
+        # Drop existing tables and views
+        cursor.execute("DROP VIEW IF EXISTS LORProps")
+        cursor.execute("DROP TABLE IF EXISTS dmxChannels")
+        cursor.execute("DROP TABLE IF EXISTS subProps")
+        cursor.execute("DROP TABLE IF EXISTS props")
+        cursor.execute("DROP TABLE IF EXISTS previews")
+        cursor.execute("DROP TABLE IF EXISTS loaded_files")
 
 
     # Create tables for previews, props, subProps, and dmxChannels
     cursor.execute("""
-        CREATE TABLE previews (
+        CREATE TABLE IF NOT EXISTS previews (
             id TEXT PRIMARY KEY,
             StageID TEXT,
             PreviewType TEXT,
@@ -42,7 +102,7 @@ def initialize_database():
     """)
 
     cursor.execute("""
-        CREATE TABLE props (
+        CREATE TABLE IF NOT EXISTS props (
             PropID TEXT PRIMARY KEY,
             Name TEXT,
             LORComment TEXT,
@@ -80,7 +140,7 @@ def initialize_database():
 
     #Revised SubProps table to include UID and StartChannel 1/14/25
     cursor.execute("""
-        CREATE TABLE subProps (
+        CREATE TABLE IF NOT EXISTS subProps (
             SubPropID TEXT PRIMARY KEY,
             Name TEXT,
             Lights INTEGER,
@@ -96,7 +156,7 @@ def initialize_database():
     """)
 
     cursor.execute("""
-        CREATE TABLE dmxChannels (
+        CREATE TABLE IF NOT EXISTS dmxChannels (
             PropId TEXT,
             Network TEXT,
             StartUniverse INTEGER,
@@ -108,9 +168,20 @@ def initialize_database():
         )
     """)
 
+    # .lorprev files already loaded, with the previews each one produced
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS loaded_files (
+            path TEXT PRIMARY KEY,
+            mtime REAL,
+            sha1 TEXT,
+            PreviewIds TEXT,  -- comma separated previews.id values
+            IgnoredRows INTEGER  -- rows INSERT OR IGNORE dropped (key held by another file)
+        )
+    """)
+
     # Create a view to join props, subProps, and dmxChannels
     cursor.execute("""
-        CREATE VIEW LORProps AS
+        CREATE VIEW IF NOT EXISTS LORProps AS
         SELECT 
             p.Name AS PropName,
             p.Network AS PropNetwork,
@@ -140,249 +211,319 @@ def initialize_database():
         ORDER BY p.LORComment, sp.Channel;
     """)
 
-
-    conn.commit()
+    # Left uncommitted: process_folder commits once every file is loaded
     return conn
 
+
+def _classify_prop(device_type, channel_grid, master_pid, n_grids):
+    """Which of the five PropClass cases applies (None: the prop isn't loaded)."""
+    if device_type == "LOR" and channel_grid:
+        if n_grids == 1:
+            return "lor_subprop" if master_pid else "lor_shared"
+        return "lor_multigrid"
+    if device_type == "DMX" and channel_grid and not master_pid and n_grids > 1:
+        return "dmx_multigrid"
+    if device_type is None:
+        return "nodevice"
+    return None
+
+# 1. Explicit subprops
+def _add_lor_subprop(attributes, grids, preview_id, rows):
+    get = attributes.get
+    rows["subProps"].append((
+        get('id'),
+        get('Name'),
+        get('Comment'),
+        get('MasterPropId'),
+        preview_id,
+        get('UID'),
+        get('StartChannel'),
+        get('Color'),
+    ))
+
+# 2. Shared LORComment, Single Grid, No MasterPropId
+def _add_lor_shared(attributes, grids, preview_id, rows):
+    # Collected here and grouped once after the whole file is read
+    # (regrouping every prop on each match was O(N^2))
+    get = attributes.get
+    grid_parts = grids[0].split(',')
+    rows["shared"][get('Comment')].append(dict(
+        attributes,  # copy: the element is cleared after its handler runs
+        PropID=get('id'),
+        PreviewId=preview_id,
+        UID=grid_parts[1] if len(grid_parts) > 1 else None,
+        StartChannel=grid_parts[2] if len(grid_parts) > 2 else None,
+    ))
+
+# 3. LOR Props with Multiple Grids
+def _add_lor_multigrid(attributes, grids, preview_id, rows):
+    get = attributes.get
+    is_master_set = False
+
+    for grid in grids:
+        grid_parts = grid.split(',')
+        network = grid_parts[0] if len(grid_parts) > 0 else None
+        uid = grid_parts[1] if len(grid_parts) > 1 else None
+        start_channel = grid_parts[2] if len(grid_parts) > 2 else None
+        end_channel = grid_parts[3] if len(grid_parts) > 3 else None
+        color = grid_parts[5] if len(grid_parts) > 5 else None
+
+        if not is_master_set:
+            # Add the first grid as the master prop
+            rows["props"].append(_prop_row(
+                PropID=get('id'),
+                Name=get('Name'),
+                LORComment=get('Comment'),
+                DeviceType="LOR",
+                PreviewId=preview_id,
+                Network=network,
+                UID=uid,
+                StartChannel=start_channel,
+                EndChannel=end_channel,
+                Color=color,
+            ))
+            is_master_set = True
+        else:
+            # Add subsequent grids as subprops
+            rows["subProps"].append((
+                f"{get('id')}-{start_channel}",
+                f"{get('Name')}",
+                f"{get('Comment')}-{start_channel.zfill(2)}",
+                get('id'),
+                preview_id,
+                uid,
+                start_channel,
+                color,
+            ))
+
+# 4. DMX Props with Multiple Grids, No MasterPropId
+def _add_dmx_multigrid(attributes, grids, preview_id, rows):
+    get = attributes.get
+    grid_parts_list = [grid.split(',') for grid in grids]
+    master_parts = min(
+        grid_parts_list,
+        key=lambda g: int(g[2]) if len(g) > 2 and g[2].isdigit() else float('inf')
+    )
+    master_channel = master_parts[2]
+
+    # Add master prop
+    rows["props"].append(_prop_row(
+        PropID=get('id'),
+        Name=get('Name'),
+        LORComment=get('Comment'),
+        DeviceType="DMX",
+        PreviewId=preview_id,
+        StartChannel=master_channel,
+    ))
+
+    # Add grids to DMX channels
+    for grid_parts in grid_parts_list:
+        # (grid_parts[3] is the end universe, which has no column)
+        rows["dmxChannels"].append((
+            get('id'),
+            grid_parts[0] if len(grid_parts) > 0 else None,
+            int(grid_parts[1]) if len(grid_parts) > 1 and grid_parts[1].isdigit() else None,
+            int(grid_parts[2]) if len(grid_parts) > 2 and grid_parts[2].isdigit() else None,
+            int(grid_parts[4]) if len(grid_parts) > 4 and grid_parts[4].isdigit() else None,
+            None,
+            preview_id,
+        ))
+
+# 5. Props with DeviceType == None
+def _add_nodevice(attributes, grids, preview_id, rows):
+    get = attributes.get
+    rows["props"].append(_prop_row(
+        PropID=get('id'),
+        Name=get('Name'),
+        LORComment=get('Comment'),
+        DeviceType=None,
+        PreviewId=preview_id,
+    ))
+
+_PROP_HANDLERS = {
+    "lor_subprop": _add_lor_subprop,
+    "lor_shared": _add_lor_shared,
+    "lor_multigrid": _add_lor_multigrid,
+    "dmx_multigrid": _add_dmx_multigrid,
+    "nodevice": _add_nodevice,
+}
+
+def _file_sha1(file_path):
+    h = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _delete_previews(conn, preview_ids):
+    """Remove everything loaded for these previews before a file is reloaded."""
+    if not preview_ids:
+        return
+    ids = [(preview_id,) for preview_id in preview_ids]
+    conn.executemany("DELETE FROM dmxChannels WHERE PreviewId = ?", ids)
+    conn.executemany("DELETE FROM subProps WHERE PreviewId = ?", ids)
+    conn.executemany("DELETE FROM props WHERE PreviewId = ?", ids)
+    conn.executemany("DELETE FROM previews WHERE id = ?", ids)
+
+def _delete_all(conn):
+    """Empty the data tables and loaded_files before every file is reloaded."""
+    for table in ("dmxChannels", "subProps", "props", "previews", "loaded_files"):
+        conn.execute(f"DELETE FROM {table}")
+
 # Revised process file code 1/15/25
 # Revised process file code 1/15/25
-def process_file(file_path, conn):
-    # Parse the XML file
-    tree = ET.parse(file_path)
-    root = tree.getroot()
+def parse_file(file_path):
+    """Parse one .lorprev into INSERT-ready rows; no DB access, so it can run in a worker process."""
     preview_id = None  # Initialize PreviewId globally
 
-    previews = {}  # Initialize as a dictionary
-    props = []
-    sub_props = []
-    dmx_channels = []
-
-    for elem in root.iter():
-        if elem.tag == "PreviewClass":
+    # Rows are collected as INSERT-ready tuples (column order of each INSERT below)
+    previews = {}  # id -> row
+    props = []  # PROP_COLS order
+    sub_props = []  # SubPropID, Name, LORComment, MasterPropId, PreviewId, UID, Channel, Color
+    dmx_channels = []  # PropId, Network, StartUniverse, StartChannel, EndChannel, Unknown, PreviewId
+    pending_shared_comment = defaultdict(list)  # LORComment -> branch 2 props
+    rows = {"props": props, "subProps": sub_props, "dmxChannels": dmx_channels,
+            "shared": pending_shared_comment}
+
+    # Stream the XML instead of building the whole tree: PreviewClass wraps every
+    # PropClass, so it is read on its start tag; each PropClass is handled on its
+    # end tag and then cleared to free its subtree.
+    for event, elem in ET.iterparse(file_path, events=("start", "end"), **_ITERPARSE_TAGS):
+        if event == "start" and elem.tag == "PreviewClass":
             # Extract StageID and PreviewId
-            import re
-            stage_match = re.search(r"Stage (\d{2})", os.path.basename(file_path))
+            basename = os.path.basename(file_path)
+            stage_match = _STAGE_RE.search(basename)
             stage_id = stage_match.group(1) if stage_match else None
-            preview_type = os.path.basename(file_path).split()[0]
+            preview_type = basename.split()[0]
             preview_id = elem.attrib.get('id')
             #print(f"Assigned PreviewId: {preview_id}")            
-            previews[preview_id] = {
-                "id": preview_id,
-                "StageID": stage_id,
-                "PreviewType": preview_type,
-                "Name": elem.attrib.get('Name', None),
-                "Revision": elem.attrib.get('Revision', None),
-                "Brightness": float(elem.attrib.get('Brightness')) if elem.attrib.get('Brightness') else None,
-                "BackgroundFile": elem.attrib.get('BackgroundFile', None),
-            }
-
-        if elem.tag == "PropClass":
+            previews[preview_id] = (
+                preview_id,
+                stage_id,
+                preview_type,
+                elem.attrib.get('Name', None),
+                elem.attrib.get('Revision', None),
+                float(elem.attrib.get('Brightness')) if elem.attrib.get('Brightness') else None,
+                elem.attrib.get('BackgroundFile', None),
+            )
+
+        if event == "end" and elem.tag == "PropClass":
             attributes = elem.attrib
-            prop_preview_id = preview_id
-            channel_grid = attributes.get('ChannelGrid', None)
-            device_type = attributes.get('DeviceType', None)
-            LORComment = attributes.get('Comment')
-
-            # 1. Explicit subprops
-            if device_type == "LOR" and channel_grid and attributes.get('MasterPropId') and len(channel_grid.split(';')) == 1:
-                sub_props.append({
-                    "SubPropID": attributes.get('id'),
-                    "Name": attributes.get('Name'),
-                    "LORComment": LORComment,
-                    "MasterPropId": attributes.get('MasterPropId'),
-                    "PreviewId": prop_preview_id,
-                    "UID": attributes.get('UID'),
-                    "Channel": attributes.get('StartChannel'),
-                    "Color": attributes.get('Color'),
-                })
-
-            # 2. Shared DisplayName (LORComment), Single Grid, No MasterPropId
-            # 2. Shared LORComment, Single Grid, No MasterPropId
-            elif device_type == "LOR" and channel_grid and not attributes.get('MasterPropId') and len(channel_grid.split(';')) == 1:
-                grouped_props = defaultdict(list)
-
-                # Group props by their LORComment
-                for prop in props:
-                    grouped_props[prop['LORComment']].append(prop)
-
-                # Debugging: Verify grouping
-                for comment, group in grouped_props.items():
-                    print(f"Grouped LORComment '{comment}': {len(group)} props")
-
-                # Process each group
-                for comment, group in grouped_props.items():
-                    if not group:
-                        continue
-
-                    # Sort group by StartChannel
-                    group_sorted = sorted(
-                        group,
-                        key=lambda x: int(x.get('StartChannel', 0)) if x.get('StartChannel') and x['StartChannel'].isdigit() else float('inf')
-                    )
-
-                    # Identify the master prop (first in the sorted list)
-                    master_prop = group_sorted[0]
-                    master_prop_id = master_prop['PropID']
-
-                    # Debugging: Verify master prop
-                    print(f"Master prop for LORComment '{comment}': {master_prop['Name']} (StartChannel={master_prop.get('StartChannel')})")
-
-                    # Parse grid parts for the master prop
-                    grid_parts = master_prop.get('ChannelGrid', '').split(',')
-                    network = grid_parts[0] if len(grid_parts) > 0 else None
-                    uid = grid_parts[1] if len(grid_parts) > 1 else None
-                    start_channel = grid_parts[2] if len(grid_parts) > 2 else None
-                    end_channel = grid_parts[3] if len(grid_parts) > 3 else None
-                    color = grid_parts[5] if len(grid_parts) > 5 else None
-
-                    # Add the master prop to the props table
-                    props.append({
-                        "PropID": master_prop_id,
-                        "Name": master_prop['Name'],
-                        "LORComment": comment,
-                        "DeviceType": device_type,
-                        "PreviewId": master_prop.get('PreviewId', None),
-                        "Network": network,
-                        "UID": uid,
-                        "StartChannel": start_channel,
-                        "EndChannel": end_channel,
-                        "Color": color,
-                        "MaxChannels": int(master_prop.get('MaxChannels', 0)),
-                        "Tag": master_prop.get('Tag', None),
-                        "Lights": int(master_prop.get('Parm2', 0)),
-                        "DimmingCurveName": master_prop.get('DimmingCurveName', None),
-                        "Segments": int(master_prop.get('Parm1', 0)),
-                        "Opacity": float(master_prop.get('Opacity', 0.0)),
-                        "MasterDimmable": master_prop.get('MasterDimmable', 'false') == 'true',
-                        "PreviewBulbSize": float(master_prop.get('PreviewBulbSize', 0.0)),
-                        "BulbShape": master_prop.get('BulbShape', None),
-                        "CustomBulbColor": master_prop.get('CustomBulbColor', None),
-                        "StartLocation": master_prop.get('StartLocation', None),
-                        "StringType": master_prop.get('StringType', None),
-                        "TraditionalColors": master_prop.get('TraditionalColors', None),
-                        "TraditionalType": master_prop.get('TraditionalType', None),
-                        "RgbOrder": master_prop.get('RgbOrder', None),
-                        "SeparateIds": master_prop.get('SeparateIds', None),
-                        "EffectBulbSize": float(master_prop.get('EffectBulbSize', 0.0)),
-                        "IndividualChannels": master_prop.get('IndividualChannels', '').strip().lower() == 'true',
-                        "LegacySequenceMethod": master_prop.get('LegacySequenceMethod', None),
-                    })
-
-                    # Add remaining props in the group to the subProps table
-                    for prop in group_sorted[1:]:
-                        # Parse grid parts for the subprop
-                        grid_parts = prop.get('ChannelGrid', '').split(',')
-                        start_channel = grid_parts[2] if len(grid_parts) > 2 else None
-                        color = grid_parts[5] if len(grid_parts) > 5 else None
-
-                        sub_props.append({
-                            "SubPropID": prop['PropID'],
-                            "Name": prop['Name'],
-                            "LORComment": comment,
-                            "MasterPropId": master_prop_id,
-                            "PreviewId": prop.get('PreviewId', None),
-                            "UID": prop.get('UID'),
-                            "Channel": start_channel,
-                            "Color": color,
-                        })
-
-                        # Debugging: Verify subprop
-                        print(f"Subprop for LORComment '{comment}': {prop['Name']} (StartChannel={start_channel})")
-
-
-
-            # 3. LOR Props with Multiple Grids
-            elif device_type == "LOR" and channel_grid and len(channel_grid.split(';')) > 1:
-                grids = channel_grid.split(';')
-                is_master_set = False
-
-                for grid in grids:
-                    grid_parts = grid.split(',')
-                    network = grid_parts[0] if len(grid_parts) > 0 else None
-                    uid = grid_parts[1] if len(grid_parts) > 1 else None
-                    start_channel = grid_parts[2] if len(grid_parts) > 2 else None
-                    end_channel = grid_parts[3] if len(grid_parts) > 3 else None
-                    color = grid_parts[5] if len(grid_parts) > 5 else None
-
-                    if not is_master_set:
-                        # Add the first grid as the master prop
-                        props.append({
-                            "PropID": attributes.get('id'),
-                            "Name": attributes.get('Name'),
-                            "LORComment": LORComment,
-                            "DeviceType": device_type,
-                            "PreviewId": prop_preview_id,
-                            "Network": network,
-                            "UID": uid,
-                            "StartChannel": start_channel,
-                            "EndChannel": end_channel,
-                            "Color": color,
-                        })
-                        is_master_set = True
-                    else:
-                        # Add subsequent grids as subprops
-                        sub_props.append({
-                            "SubPropID": f"{attributes.get('id')}-{start_channel}",
-                            "Name": f"{attributes.get('Name')}",
-                            "LORComment": f"{attributes.get('Comment')}-{start_channel.zfill(2)}",
-                            "MasterPropId": attributes.get('id'),
-                            "PreviewId": prop_preview_id,
-                            "Network": network,
-                            "UID": uid,
-                            "Channel": start_channel,
-                            "Color": color,
-                        })
-
-
-            # 4. DMX Props with Multiple Grids, No MasterPropId
-            elif device_type == "DMX" and channel_grid and not attributes.get('MasterPropId') and len(channel_grid.split(';')) > 1:
-                grids = channel_grid.split(';')
-                master_prop = min(
-                    grids,
-                    key=lambda g: int(g.split(',')[2]) if len(g.split(',')) > 2 and g.split(',')[2].isdigit() else float('inf')
-                )
-                master_channel = master_prop.split(',')[2]
-
-                # Add master prop
-                props.append({
-                    "PropID": attributes.get('id'),
-                    "Name": attributes.get('Name'),
-                    "LORComment": LORComment,
-                    "DeviceType": device_type,
-                    "PreviewId": prop_preview_id,
-                    "StartChannel": master_channel,
-                })
-
-                # Add grids to DMX channels
-                for grid in grids:
-                    grid_parts = grid.split(',')
-                    dmx_channels.append({
-                        "PropId": attributes.get('id'),
-                        "Network": grid_parts[0] if len(grid_parts) > 0 else None,
-                        "StartUniverse": int(grid_parts[1]) if len(grid_parts) > 1 and grid_parts[1].isdigit() else None,
-                        "StartChannel": int(grid_parts[2]) if len(grid_parts) > 2 and grid_parts[2].isdigit() else None,
-                        "EndUniverse": int(grid_parts[3]) if len(grid_parts) > 3 and grid_parts[3].isdigit() else None,
-                        "EndChannel": int(grid_parts[4]) if len(grid_parts) > 4 and grid_parts[4].isdigit() else None,
-                        "PreviewId": prop_preview_id,
-                    })
-
-            # 5. Props with DeviceType == None
-            elif device_type is None:
-                props.append({
-                    "PropID": attributes.get('id'),
-                    "Name": attributes.get('Name'),
-                    "LORComment": LORComment,
-                    "DeviceType": device_type,
-                    "PreviewId": prop_preview_id,
-                })
+            get = attributes.get
+            channel_grid = get('ChannelGrid', None)
+            master_pid = get('MasterPropId')
+            # Split the grid list once; the handlers reuse it
+            grids = channel_grid.split(';') if channel_grid else []
+            kind = _classify_prop(get('DeviceType', None), channel_grid, master_pid, len(grids))
+            if kind:
+                _PROP_HANDLERS[kind](attributes, grids, preview_id, rows)
+
+            elem.clear()
+
+    # 2 (cont). One pass per shared-LORComment group: the lowest StartChannel
+    # becomes the master prop, the rest become its subprops.
+    # Debugging: Verify grouping
+    if log.isEnabledFor(logging.DEBUG):
+        for comment, group in pending_shared_comment.items():
+            log.debug("Grouped LORComment '%s': %d props", comment, len(group))
+
+    # Process each group
+    for comment, group in pending_shared_comment.items():
+        if not group:
+            continue
+
+        # Sort group by StartChannel
+        group_sorted = sorted(
+            group,
+            key=lambda x: int(x.get('StartChannel', 0)) if x.get('StartChannel') and x['StartChannel'].isdigit() else float('inf')
+        )
+
+        # Identify the master prop (first in the sorted list)
+        master_prop = group_sorted[0]
+        master_prop_id = master_prop['PropID']
+
+        # Debugging: Verify master prop
+        log.debug("Master prop for LORComment '%s': %s (StartChannel=%s)",
+                  comment, master_prop['Name'], master_prop.get('StartChannel'))
+
+        # Parse grid parts for the master prop
+        grid_parts = master_prop.get('ChannelGrid', '').split(',')
+        network = grid_parts[0] if len(grid_parts) > 0 else None
+        uid = grid_parts[1] if len(grid_parts) > 1 else None
+        start_channel = grid_parts[2] if len(grid_parts) > 2 else None
+        end_channel = grid_parts[3] if len(grid_parts) > 3 else None
+        color = grid_parts[5] if len(grid_parts) > 5 else None
+
+        # Add the master prop to the props table
+        props.append(_prop_row(
+            PropID=master_prop_id,
+            Name=master_prop['Name'],
+            LORComment=comment,
+            DeviceType="LOR",
+            PreviewId=master_prop.get('PreviewId', None),
+            Network=network,
+            UID=uid,
+            StartChannel=start_channel,
+            EndChannel=end_channel,
+            Color=color,
+            MaxChannels=int(master_prop.get('MaxChannels', 0)),
+            Tag=master_prop.get('Tag', None),
+            Lights=int(master_prop.get('Parm2', 0)),
+            DimmingCurveName=master_prop.get('DimmingCurveName', None),
+            Segments=int(master_prop.get('Parm1', 0)),
+            Opacity=float(master_prop.get('Opacity', 0.0)),
+            MasterDimmable=master_prop.get('MasterDimmable', 'false') == 'true',
+            PreviewBulbSize=float(master_prop.get('PreviewBulbSize', 0.0)),
+            BulbShape=master_prop.get('BulbShape', None),
+            CustomBulbColor=master_prop.get('CustomBulbColor', None),
+            StartLocation=master_prop.get('StartLocation', None),
+            StringType=master_prop.get('StringType', None),
+            TraditionalColors=master_prop.get('TraditionalColors', None),
+            TraditionalType=master_prop.get('TraditionalType', None),
+            RgbOrder=master_prop.get('RgbOrder', None),
+            SeparateIds=master_prop.get('SeparateIds', None),
+            EffectBulbSize=float(master_prop.get('EffectBulbSize', 0.0)),
+            IndividualChannels=master_prop.get('IndividualChannels', '').strip().lower() == 'true',
+            LegacySequenceMethod=master_prop.get('LegacySequenceMethod', None),
+        ))
+
+        # Add remaining props in the group to the subProps table
+        for prop in group_sorted[1:]:
+            # Parse grid parts for the subprop
+            grid_parts = prop.get('ChannelGrid', '').split(',')
+            start_channel = grid_parts[2] if len(grid_parts) > 2 else None
+            color = grid_parts[5] if len(grid_parts) > 5 else None
+
+            sub_props.append((
+                prop['PropID'],
+                prop['Name'],
+                comment,
+                master_prop_id,
+                prop.get('PreviewId', None),
+                prop.get('UID'),
+                start_channel,
+                color,
+            ))
+
+            # Debugging: Verify subprop
+            log.debug("Subprop for LORComment '%s': %s (StartChannel=%s)",
+                      comment, prop['Name'], start_channel)
 
     # for prop in props:
     #     if len(prop) != 32:
     #         print(f"Incomplete prop: {prop}")
 
 
-    # Insert data into the database
+    return previews, props, sub_props, dmx_channels
+
+
+def _insert_rows(conn, previews, props, sub_props, dmx_channels):
+    """
+    Insert the rows of one parsed file. Returns its preview ids and how many
+    rows INSERT OR IGNORE dropped because another file already held the key.
+    """
     cursor = conn.cursor()
+    ignored = 0
 
     # Insert previews
     cursor.executemany(
@@ -390,62 +531,13 @@ def process_file(file_path, conn):
         INSERT OR IGNORE INTO previews (id, StageID, PreviewType, Name, Revision, Brightness, BackgroundFile)
         VALUES (?, ?, ?, ?, ?, ?, ?)
         """,
-        [(p['id'], p['StageID'], p['PreviewType'], p['Name'], p['Revision'], p['Brightness'], p['BackgroundFile']) for p in previews.values()]
-    )
-
-    # Insert props
-    cursor.executemany(
-        """
-        INSERT OR IGNORE INTO props (
-            PropID, Name, LORComment, DeviceType, MaxChannels, Tag, Network, UID,
-            StartChannel, EndChannel, Unknown, Color, Lights, DimmingCurveName, Segments,
-            Opacity, MasterDimmable, PreviewBulbSize, BulbShape, CustomBulbColor,
-            StartLocation, StringType, TraditionalColors, TraditionalType, RgbOrder,
-            SeparateIds, EffectBulbSize, IndividualChannels, LegacySequenceMethod,
-            MasterPropId, PreviewId
-        )
-        VALUES (
-            ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-        )
-        """,
-        [
-            (
-                prop.get('PropID'),
-                prop.get('Name'),
-                prop.get('LORComment'),
-                prop.get('DeviceType'),
-                prop.get('MaxChannels', 0),  # Default to 0
-                prop.get('Tag'),
-                prop.get('Network'),
-                prop.get('UID'),
-                prop.get('StartChannel'),
-                prop.get('EndChannel'),
-                prop.get('Unknown'),
-                prop.get('Color'),
-                prop.get('Lights', 0),  # Default to 0
-                prop.get('DimmingCurveName'),
-                prop.get('Segments', 0),  # Default to 0
-                prop.get('Opacity', 0.0),  # Default to 0.0
-                prop.get('MasterDimmable', False),
-                prop.get('PreviewBulbSize', 0.0),  # Default to 0.0
-                prop.get('BulbShape'),
-                prop.get('CustomBulbColor'),
-                prop.get('StartLocation'),
-                prop.get('StringType'),
-                prop.get('TraditionalColors'),
-                prop.get('TraditionalType'),
-                prop.get('RgbOrder'),
-                prop.get('SeparateIds'),
-                prop.get('EffectBulbSize', 0.0),  # Default to 0.0
-                prop.get('IndividualChannels', False),
-                prop.get('LegacySequenceMethod'),
-                prop.get('MasterPropId'),
-                prop.get('PreviewId')
-            )
-            for prop in props
-        ]
+        previews.values()
     )
+    ignored += len(previews) - cursor.rowcount
 
+    # Insert props (placeholders generated from PROP_COLS)
+    cursor.executemany(PROP_SQL, props)
+    ignored += len(props) - cursor.rowcount
 
 
     # Insert subprops
@@ -454,8 +546,9 @@ def process_file(file_path, conn):
         INSERT OR IGNORE INTO subProps (SubPropID, Name, LORComment, MasterPropId, PreviewId, UID, Channel, Color)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """,
-        [(s['SubPropID'], s['Name'], s['LORComment'], s['MasterPropId'], s['PreviewId'], s['UID'], s['Channel'], s['Color']) for s in sub_props]
+        sub_props
     )
+    ignored += len(sub_props) - cursor.rowcount
 
     # Insert DMX channels
     cursor.executemany(
@@ -463,30 +556,149 @@ def process_file(file_path, conn):
         INSERT OR IGNORE INTO dmxChannels (PropId, Network, StartUniverse, StartChannel, EndChannel, Unknown, PreviewId)
         VALUES (?, ?, ?, ?, ?, ?, ?)
         """,
-        [(d['PropId'], d['Network'], d['StartUniverse'], d['StartChannel'], d['EndChannel'], d.get('Unknown'), d['PreviewId']) for d in dmx_channels]
+        dmx_channels
     )
 
-    conn.commit()
-
-
+    # dmxChannels has no key, so only the three tables above can drop rows
+    return list(previews), ignored
+
+
+def _parse_job(file_path):
+    # Pool worker: tag the result with its file
+    return file_path, parse_file(file_path)
+
+
+def _init_worker(level):
+    # Spawned workers (Windows) never run the __main__ block, so give them the
+    # parent's logging setup or parse_file's --verbose traces go nowhere
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+
+def _load_files(conn, file_paths, stamps):
+    """
+    Parse and insert these files, recording each one in loaded_files.
+    Returns how many rows INSERT OR IGNORE dropped because another file
+    already held the key.
+    """
+    ignored_total = 0
+    # Files parse independently, so spread them over the CPU cores; only
+    # this process writes to the DB. imap() hands results back in file order,
+    # so INSERT OR IGNORE keeps the same winner for a shared key on every run
+    if len(file_paths) > 1:
+        pool = multiprocessing.Pool(min(len(file_paths), os.cpu_count() or 1),
+                                    initializer=_init_worker,
+                                    initargs=(logging.getLogger().getEffectiveLevel(),))
+        results = pool.imap(_parse_job, file_paths)
+    else:
+        pool = None
+        results = map(_parse_job, file_paths)
+    try:
+        for file_path, parsed in results:
+            print(f"Processing file: {file_path}")
+            preview_ids, ignored = _insert_rows(conn, *parsed)
+            ignored_total += ignored
+            conn.execute(
+                "INSERT OR REPLACE INTO loaded_files (path, mtime, sha1, PreviewIds, IgnoredRows) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (file_path, *stamps[file_path], ",".join(preview_ids), ignored),
+            )
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return ignored_total
 
 
-def process_folder(folder_path):
+def process_folder(folder_path, rebuild=False):
     # Initialize the database
-    conn = initialize_database()
-
-    # Process all .lorprev files in the specified folder
-    for file_name in os.listdir(folder_path):
-        if file_name.lower().endswith(".lorprev"):
-            file_path = os.path.join(folder_path, file_name)
-            print(f"Processing file: {file_path}")
-            process_file(file_path, conn)
+    conn = initialize_database(rebuild)
+
+    # Process all .lorprev files in the specified folder inside the
+    # transaction opened by initialize_database, so readers only ever see
+    # the old or the fully rebuilt data
+    try:
+        loaded = {
+            path: (mtime, sha1, preview_ids.split(",") if preview_ids else [], ignored)
+            for path, mtime, sha1, preview_ids, ignored in conn.execute(
+                "SELECT path, mtime, sha1, PreviewIds, IgnoredRows FROM loaded_files")
+        }
+        file_paths = sorted(
+            os.path.abspath(os.path.join(folder_path, file_name))
+            for file_name in os.listdir(folder_path)
+            if file_name.lower().endswith(".lorprev")
+        )
+        # Files that were loaded before but are gone now
+        removed = loaded.keys() - set(file_paths)
+
+        stamps = {}   # path -> (mtime, sha1) for every file in the folder
+        changed = []  # files to (re)load
+        for file_path in file_paths:
+            mtime = os.path.getmtime(file_path)
+            previous = loaded.get(file_path)
+            if previous and previous[0] == mtime:
+                stamps[file_path] = previous[:2]
+                continue
+            sha1 = _file_sha1(file_path)
+            stamps[file_path] = (mtime, sha1)
+            if previous and previous[1] == sha1:
+                # Touched but not edited
+                conn.execute("UPDATE loaded_files SET mtime = ? WHERE path = ?", (mtime, file_path))
+                continue
+            changed.append(file_path)
+
+        # INSERT OR IGNORE keeps the row of whichever file loaded a shared
+        # PropID/SubPropID/preview id first, and the other file's row is never
+        # stored. Deleting the winner doesn't bring that row back, so reloading
+        # only the changed files matches a rebuild just when no file lost rows
+        # to another one; otherwise every file is reloaded
+        reload_all = bool(removed or any(path in loaded for path in changed)) and any(
+            previous[3] for previous in loaded.values())
+        if not reload_all:
+            for file_path in removed:
+                print(f"Removing file: {file_path}")
+                _delete_previews(conn, loaded[file_path][2])
+                conn.execute("DELETE FROM loaded_files WHERE path = ?", (file_path,))
+            for file_path in changed:
+                if file_path in loaded:
+                    _delete_previews(conn, loaded[file_path][2])
+            ignored = _load_files(conn, changed, stamps)
+            # (nothing to redo when this already loaded every file, e.g. --rebuild)
+            reload_all = ignored > 0 and len(changed) < len(file_paths)
+        if reload_all:
+            print("Previews share keys; reloading every file")
+            _delete_all(conn)
+            _load_files(conn, file_paths, stamps)
+
+        # Index the join/filter columns once everything is loaded (cheaper than
+        # maintaining the indexes during the inserts). One execute() per
+        # statement: executescript() would commit the open transaction first
+        for statement in (
+            "CREATE INDEX IF NOT EXISTS idx_props_previewid ON props(PreviewId)",
+            "CREATE INDEX IF NOT EXISTS idx_props_comment ON props(LORComment)",
+            "CREATE INDEX IF NOT EXISTS idx_subprops_master ON subProps(MasterPropId)",
+            "CREATE INDEX IF NOT EXISTS idx_dmx_propid ON dmxChannels(PropId)",
+            "ANALYZE",
+        ):
+            conn.execute(statement)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
 
     conn.close()
     print(f"Processing complete. Data saved to {os.path.abspath('LOR.db')}")
 
 if __name__ == "__main__":
-    folder_path = input("Enter the folder path containing .lorprev files: ")
-    process_folder(folder_path)
+    parser = argparse.ArgumentParser(description="Build LOR.db from a folder of .lorprev files.")
+    parser.add_argument("folder", nargs="?", help="folder containing .lorprev files (prompted if omitted)")
+    parser.add_argument("--verbose", action="store_true", help="log prop grouping details")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="reload every file instead of only those changed since the last run")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING,
+                        format=LOG_FORMAT)
+
+    folder_path = args.folder or input("Enter the folder path containing .lorprev files: ")
+    process_folder(folder_path, rebuild=args.rebuild)
 
 
@@ -4,14 +4,76 @@
 
 
 import os
-import xml.etree.ElementTree as ET
+import re
+try:
+    from lxml import etree as ET  # C parser, much faster on large previews
+    # lxml can filter iterparse events itself, so only these tags reach Python
+    ITERPARSE_TAGS = {"tag": ("{*}PreviewClass", "PropClass")}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    ITERPARSE_TAGS = {}
 import sqlite3
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import uuid
 
 DEBUG = False  # Global debug flag
+DIGITS_RE = re.compile(r"\d+")  # StageID digits in a preview Name
 DB_FILE = "G:\\Shared drives\\MSB Database\\database\\lor_output_v5.db"
 
+# INSERT statements, prepared once and fed to executemany()
+PROP_NONE_SQL = """
+INSERT OR REPLACE INTO props (PropID, Name, LORComment, DeviceType, Lights, PreviewId)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+PROP_GRID_SQL = """
+INSERT OR REPLACE INTO props (
+    PropID, Name, LORComment, DeviceType, Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SUBPROP_GRID_SQL = """
+INSERT OR REPLACE INTO subProps (
+    SubPropID, Name, LORComment, DeviceType, Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+DUPLICATE_PROP_SQL = """
+INSERT OR REPLACE INTO duplicateProps (PropID, Name, LORComment, DeviceType, PreviewId, Reason)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+DMX_CHANNEL_SQL = """
+INSERT OR REPLACE INTO dmxChannels (
+    PropId, Network, StartUniverse, StartChannel, EndChannel, Unknown, PreviewId
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Import-only settings, applied once to the loader's connection; the loader is the
+# DB's only writer while it rebuilds it
+IMPORT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+)
+
+def open_import_connection():
+    """One connection for the whole load, in autocommit mode (load_file issues BEGIN/COMMIT)."""
+    conn = sqlite3.connect(DB_FILE, isolation_level=None)
+    for pragma in IMPORT_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def close_import_connection(conn):
+    """
+    Put the DB back in rollback-journal mode and close. journal_mode=WAL is stored in
+    the DB file, and the shared-drive DB must not be left with -wal/-shm side files.
+    """
+    try:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")  # journal_mode can't change inside a transaction
+        conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        conn.close()
+
 def setup_database():
     """Initialize the database schema, dropping tables if they already exist."""
     conn = sqlite3.connect(DB_FILE)
@@ -160,13 +222,26 @@ def setup_database():
     conn.close()
     print("[DEBUG] Database setup complete, all tables created.")
 
+def create_indexes():
+    """Index the join columns once all files are loaded (cheaper than maintaining them during the inserts)."""
+    conn = sqlite3.connect(DB_FILE)
+    conn.executescript("""
+    CREATE INDEX IF NOT EXISTS idx_props_previewid ON props(PreviewId);
+    CREATE INDEX IF NOT EXISTS idx_subprops_master ON subProps(MasterPropId);
+    CREATE INDEX IF NOT EXISTS idx_dmx_preview ON dmxChannels(PreviewId);
+    ANALYZE;
+    """)
+    conn.close()
+
 # Function to check for duplicate PropID and log it to the duplicateProps table if found
-def handle_duplicate_prop(cursor, prop_id, name, lor_comment, device_type, preview_id, reason):
+def handle_duplicate_prop(dup_rows, seen_prop_ids, file_prop_ids, prop_id, name, lor_comment, device_type, preview_id, reason):
     """
-    Check for duplicate PropID and log it to the duplicateProps table if found.
+    Check for duplicate PropID and queue it for the duplicateProps table if found.
 
     Args:
-        cursor (sqlite3.Cursor): Database cursor.
+        dup_rows (list): duplicateProps rows, written with DUPLICATE_PROP_SQL by the caller.
+        seen_prop_ids (set): PropIDs committed by earlier files (see process_folder).
+        file_prop_ids (set): PropIDs written by the current file; prop_id is added when it is new.
         prop_id (str): The PropID being checked.
         name (str): The Name of the prop.
         lor_comment (str): The LORComment of the prop.
@@ -178,37 +253,123 @@ def handle_duplicate_prop(cursor, prop_id, name, lor_comment, device_type, previ
         bool: True if duplicate, False otherwise.
     """
     # Check if PropID already exists in the props table
-    cursor.execute("SELECT COUNT(*) FROM props WHERE PropID = ?", (prop_id,))
-    count = cursor.fetchone()[0]
-
-    if count > 0:
+    if prop_id in seen_prop_ids or prop_id in file_prop_ids:
         # Log the duplicate in duplicateProps table
-        cursor.execute("""
-        INSERT OR REPLACE INTO duplicateProps (PropID, Name, LORComment, DeviceType, PreviewId, Reason)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """, (prop_id, name, lor_comment, device_type, preview_id, reason))
-        print(f"[INFO] Logged duplicate PropID: {prop_id} (Reason: {reason})")
+        dup_rows.append((prop_id, name, lor_comment, device_type, preview_id, reason))
+        if DEBUG:
+            print(f"[INFO] Logged duplicate PropID: {prop_id} (Reason: {reason})")
         return True  # Duplicate detected
+    file_prop_ids.add(prop_id)
     return False  # No duplicate
 
 
 
 
-def locate_preview_class_deep(file_path):
-    """Locate the PreviewClass element at any depth in the XML tree."""
-    try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+def last_row_per_id(rows):
+    """
+    Keep only the last row for each id (first column).
 
-        # Deep search for PreviewClass
-        for element in root.iter():
-            if element.tag.endswith("PreviewClass"):  # Handle namespaces or simple tag names
-                return element
-        return None
-    except ET.ParseError as e:
-        print(f"[ERROR] Failed to parse {file_path}: {e}")
+    A prop gets one row per ChannelGrid group but props/subProps hold one row per id, so
+    INSERT OR REPLACE would delete and re-insert it for every group and keep the last one.
+    Dropping the overwritten rows up front leaves the same table with one plain insert per id.
+    """
+    return list({row[0]: row for row in rows}.values())
+
+def to_int(value):
+    """Return int(value), or None when it is missing or not an integer."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
         return None
 
+def parse_grid(channel_grid):
+    """
+    Split a ChannelGrid string once into one tuple per ';' group:
+    (Network, UID, StartChannel, EndChannel, Unknown, Color), with the channels as int
+    (None when missing or not numeric).
+    """
+    if not channel_grid:
+        return []
+    return [
+        (
+            p[0] if len(p) > 0 else None,
+            p[1] if len(p) > 1 else None,
+            to_int(p[2]) if len(p) > 2 else None,
+            to_int(p[3]) if len(p) > 3 else None,
+            p[4] if len(p) > 4 else None,
+            p[5] if len(p) > 5 else None,
+        )
+        for p in (grid.split(",") for grid in channel_grid.split(";"))
+    ]
+
+def read_lorprev(file_path):
+    """
+    Stream a .lorprev file and return (PreviewClass attributes, list of PropClass attributes).
+
+    Each PropClass is copied to a plain dict, cleared and detached from the PreviewClass as
+    soon as it has been read, so only one prop's elements are in memory at a time.
+    """
+    preview = None
+    preview_element = None
+    props = []
+    for event, element in ET.iterparse(file_path, events=("start", "end"), **ITERPARSE_TAGS):
+        if event == "start":
+            # PreviewClass at any depth; its attributes are complete on the start tag
+            if preview is None and element.tag.endswith("PreviewClass"):  # Handle namespaces or simple tag names
+                preview = dict(element.attrib)
+                preview_element = element
+        elif element.tag == "PropClass":
+            props.append(dict(element.attrib))
+            element.clear()
+            # clear() leaves the empty element in its parent; drop it from there too
+            if preview_element is not None:
+                try:
+                    preview_element.remove(element)
+                except ValueError:
+                    pass  # Not a direct child of PreviewClass
+    return preview, props
+
+def bucket_props(props):
+    """
+    Walk the props once and split them by how they are processed: DeviceType None props as a list,
+    and DMX, LOR and multi-grid LOR props grouped by LORComment. Each group tracks its master
+    (the member with the lowest StartChannel) as members are added, so the passes need no min() scan.
+    Multi-grid LOR props are in both LOR groupings, as both LOR passes see them.
+
+    Returns:
+        tuple: (none_props, dmx_groups, lor_groups, lor_multi_groups); each group is
+        {"members": [(prop, grids)], "master": (prop, grids), "master_sc": StartChannel}.
+    """
+    none_props = []
+    dmx_groups, lor_groups, lor_multi_groups = {}, {}, {}
+    for prop in props:
+        device_type = prop.get("DeviceType")
+        if device_type == "None":
+            none_props.append(prop)
+            continue
+        channel_grid = prop.get("ChannelGrid", "")
+        if device_type == "DMX":
+            targets = (dmx_groups,)
+        elif device_type == "LOR":
+            targets = (lor_groups, lor_multi_groups) if ";" in channel_grid else (lor_groups,)
+        else:
+            continue
+
+        LORComment = prop.get("Comment", "")
+        grids = parse_grid(channel_grid)
+        start_channel = grids[0][2] if grids and grids[0][2] is not None else float("inf")
+        entry = (prop, grids)
+        for groups in targets:
+            group = groups.get(LORComment)
+            if group is None:
+                groups[LORComment] = {"members": [entry], "master": entry, "master_sc": start_channel}
+            else:
+                group["members"].append(entry)
+                if start_channel < group["master_sc"]:  # first of equal StartChannels wins, as with min()
+                    group["master"] = entry
+                    group["master_sc"] = start_channel
+    return none_props, dmx_groups, lor_groups, lor_multi_groups
+
 def process_preview(preview):
     """Extract and return data from the <PreviewClass> element."""
     preview_data = {
@@ -224,13 +385,10 @@ def process_preview(preview):
 
 def extract_stage_id(name):
     """Extract StageID from the Name field."""
-    return ''.join(filter(str.isdigit, name)) if name else None
+    return "".join(DIGITS_RE.findall(name)) if name else None
 
-def insert_preview_data(preview_data):
+def insert_preview_data(cursor, preview_data):
     """Insert preview data into the database."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-
     cursor.execute("""
     INSERT OR REPLACE INTO previews (id, StageID, Name, Revision, Brightness, BackgroundFile)
     VALUES (?, ?, ?, ?, ?, ?)
@@ -243,430 +401,203 @@ def insert_preview_data(preview_data):
         preview_data["BackgroundFile"]
     ))
 
-    conn.commit()
-    conn.close()
     if DEBUG:
         print(f"[DEBUG] Inserted Preview into database: {preview_data}")
 
-def process_none_props(preview_id, root):
+def process_all_props(cursor, preview_id, buckets, seen_prop_ids, file_prop_ids):
     """
-    Process props with DeviceType == None:
-    - Aggregate lights (Parm2) by LORComment.
-    - Ensure one entry per LORComment in the props table.
+    Process all props of one preview (bucketed by bucket_props) in one pass and write them with
+    one executemany per table:
+    - DeviceType == None: aggregate lights (Parm2) by LORComment, one props entry per LORComment
+      named after the last prop seen.
+    - DeviceType == DMX: per LORComment, the master prop (lowest StartChannel) goes to the props
+      table and the remaining props to the dmxChannels table.
+    - DeviceType == LOR: per LORComment, the master prop goes to the props table and the remaining
+      props to the subProps table, with their grid parts. If the master's Name contains 'spare',
+      it is placed directly into the props table.
+    - LOR props with multiple ChannelGrid groups: grouped and written again the same way (without
+      the spare rule), so masters already written by the LOR pass are logged as duplicates.
+    - Duplicate PropIDs are logged to the duplicateProps table instead of the props table.
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-
-    props_summary = defaultdict(lambda: {"Lights": 0, "Name": None, "PropID": None, "DeviceType": None})
-
-    # Collect and aggregate data for props with DeviceType == "None"
-    for prop in root.findall(".//PropClass"):
-        device_type = prop.get("DeviceType")
-        if device_type == "None":
-            LORComment = prop.get("Comment")
-            Parm2 = prop.get("Parm2")
-            lights = int(Parm2) if Parm2 and Parm2.isdigit() else 0
-
-            # Aggregate lights by LORComment
-            props_summary[LORComment]["Lights"] += lights
-            props_summary[LORComment]["Name"] = prop.get("Name")
-            props_summary[LORComment]["PropID"] = prop.get("id")
-            props_summary[LORComment]["DeviceType"] = device_type
-
-    # Insert aggregated props into the database
-    for LORComment, prop_data in props_summary.items():
-        if handle_duplicate_prop(cursor, prop_data["PropID"], prop_data["Name"], LORComment, prop_data["DeviceType"], preview_id, "Duplicate PropID detected"):
+    none_props, dmx_groups, lor_groups, lor_multi_groups = buckets
+    none_rows, props_rows, subprops_rows, dmx_rows, dup_rows = [], [], [], [], []
+    # Bound once for the loops below
+    add_prop = props_rows.append
+    add_subprop = subprops_rows.append
+    is_duplicate = handle_duplicate_prop
+    reason = "Duplicate PropID detected"
+
+    # DeviceType == None: aggregate lights by LORComment
+    lights_by_comment = defaultdict(int)
+    meta_by_comment = {}  # LORComment -> (Name, PropID, DeviceType) of the last prop
+    for prop in none_props:
+        LORComment = prop.get("Comment")
+        lights_by_comment[LORComment] += to_int(prop.get("Parm2")) or 0
+        # Overwritten on every prop: the last prop per LORComment names the entry
+        meta_by_comment[LORComment] = (prop.get("Name"), prop.get("id"), prop.get("DeviceType"))
+
+    for LORComment, (name, prop_id, device_type) in meta_by_comment.items():
+        if is_duplicate(dup_rows, seen_prop_ids, file_prop_ids, prop_id, name, LORComment, device_type, preview_id, reason):
             continue  # Skip duplicate
+        none_rows.append((prop_id, name, LORComment, device_type, lights_by_comment[LORComment], preview_id))
+        if DEBUG:
+            print(f"[DEBUG] Inserted Prop into database: {none_rows[-1]}")
 
-        cursor.execute("""
-        INSERT OR REPLACE INTO props (PropID, Name, LORComment, DeviceType, Lights, PreviewId)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            prop_data["PropID"],
-            prop_data["Name"],
-            LORComment,
-            prop_data["DeviceType"],
-            prop_data["Lights"],
-            preview_id
-        ))
-    if DEBUG:        
-        print(f"[DEBUG] Inserted Prop into database: {prop_data}")
-
-    conn.commit()
-    conn.close()
-
-def process_dmx_props(preview_id, root):
-    """
-    Process props with DeviceType == DMX:
-    - Identify groups by LORComment.
-    - Select the prop with the lowest StartChannel as the master prop.
-    - Insert the master prop into the props table.
-    - Insert remaining props into the dmxChannels table.
-    """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-
-    # Group props by LORComment
-    props_grouped_by_comment = defaultdict(list)
-    for prop in root.findall(".//PropClass"):
-        if prop.get("DeviceType") == "DMX":
-            LORComment = prop.get("Comment", "")
-            props_grouped_by_comment[LORComment].append(prop)
-
-    # Process grouped props
-    for LORComment, props in props_grouped_by_comment.items():
-        # Identify the master prop (lowest StartChannel)
-        master_prop = min(
-            props,
-            key=lambda x: int(x.get("ChannelGrid", "").split(",")[2]) if x.get("ChannelGrid") else float("inf")
-        )
-
+    # DeviceType == DMX
+    for LORComment, group in dmx_groups.items():
+        master_prop, master_grids = group["master"]
         master_prop_id = master_prop.get("id")
         name = master_prop.get("Name", "")
         device_type = master_prop.get("DeviceType", "DMX")
 
-        # Check for duplicate PropID
-        if handle_duplicate_prop(cursor, master_prop_id, name, LORComment, device_type, preview_id, "Duplicate PropID detected"):
+        if is_duplicate(dup_rows, seen_prop_ids, file_prop_ids, master_prop_id, name, LORComment, device_type, preview_id, reason):
             continue  # Skip duplicate
 
-        # Insert master prop into the props table
-        cursor.execute("""
-        INSERT OR REPLACE INTO props (
-            PropID, Name, LORComment, DeviceType, Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        # Master prop into the props table
+        add_prop((
             master_prop_id,
             name,
             LORComment,
             device_type,
             master_prop.get("Network"),
             master_prop.get("UID"),
-            int(master_prop.get("ChannelGrid", "").split(",")[2]) if master_prop.get("ChannelGrid") else None,
-            int(master_prop.get("ChannelGrid", "").split(",")[3]) if master_prop.get("ChannelGrid") else None,
-            master_prop.get("ChannelGrid", "").split(",")[4] if master_prop.get("ChannelGrid") else None,
-            master_prop.get("ChannelGrid", "").split(",")[5] if master_prop.get("ChannelGrid") else None,
+            *(master_grids[0][2:] if master_grids else (None, None, None, None)),
             preview_id
         ))
         if DEBUG:
             print(f"[DEBUG] Inserted Master DMX Prop: {master_prop_id}")
 
-        # Process remaining props as DMX channels
-        for prop in props:
-            if prop.get("id") == master_prop_id:
-                continue  # Skip the master prop
-
+        # Remaining props as DMX channels
+        for prop, grids in group["members"]:
             prop_id = prop.get("id")
-            channel_grid = prop.get("ChannelGrid", "")
-            grid_parts = channel_grid.split(",") if channel_grid else []
-
-            cursor.execute("""
-            INSERT OR REPLACE INTO dmxChannels (
-                PropId, Network, StartUniverse, StartChannel, EndChannel, Unknown, PreviewId
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                prop_id,
-                grid_parts[0] if len(grid_parts) > 0 else None,
-                grid_parts[1] if len(grid_parts) > 1 else None,
-                int(grid_parts[2]) if len(grid_parts) > 2 and grid_parts[2].isdigit() else None,
-                int(grid_parts[3]) if len(grid_parts) > 3 and grid_parts[3].isdigit() else None,
-                grid_parts[4] if len(grid_parts) > 4 else None,
-                preview_id
-            ))
+            if prop_id == master_prop_id:
+                continue  # Skip the master prop
+            # Network, StartUniverse, StartChannel, EndChannel, Unknown of the first group
+            grid = grids[0] if grids else (None,) * 6
+            dmx_rows.append((prop_id, *grid[:5], preview_id))
             if DEBUG:
                 print(f"[DEBUG] Inserted DMX Channel for Prop: {prop_id}")
 
-    conn.commit()
-    conn.close()
-
-
-def process_lor_props(preview_id, root):
-    """
-    Process props with DeviceType == LOR:
-    - Single ChannelGrid
-    - Identify the master prop as the prop with the lowest StartChannel among props with the same Comment.
-    - Insert the master prop into the props table, including its grid parts.
-    - Insert remaining props into the subProps table, linking them to the master prop and including their grid parts.
-    - If the Name contains 'spare', place the prop directly into the props table and save grid parts.
-    """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-
-    props_grouped_by_comment = defaultdict(list)
-
-    # Group props by LORComment
-    for prop in root.findall(".//PropClass"):
-        device_type = prop.get("DeviceType")
-        if device_type == "LOR":
-            LORComment = prop.get("Comment", "")
-            props_grouped_by_comment[LORComment].append(prop)
-
-    # Process grouped props
-    for LORComment, props in props_grouped_by_comment.items():
-        # Identify the master prop (lowest StartChannel)
-        master_prop = min(
-            props,
-            key=lambda x: int(x.get("ChannelGrid", "").split(",")[2])
-            if x.get("ChannelGrid") and len(x.get("ChannelGrid").split(",")) > 2 and x.get("ChannelGrid").split(",")[2].isdigit()
-            else float("inf")
-        )
-
-        master_prop_id = master_prop.get("id")
-        name = master_prop.get("Name", "")
-        device_type = master_prop.get("DeviceType", "LOR")
-        channel_grid = master_prop.get("ChannelGrid", "")
-
-        # Special Rule: If "spare" is in the Name, insert directly into the props table
-        if "spare" in name.lower():
-            grid_parts = channel_grid.split(";") if channel_grid else []
-            for grid in grid_parts:
-                grid_data = grid.split(",")
-                cursor.execute("""
-                INSERT OR REPLACE INTO props (
-                    PropID, Name, LORComment, DeviceType, Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    master_prop_id,
-                    name,
-                    LORComment,
-                    device_type,
-                    grid_data[0] if len(grid_data) > 0 else None,
-                    grid_data[1] if len(grid_data) > 1 else None,
-                    int(grid_data[2]) if len(grid_data) > 2 and grid_data[2].isdigit() else None,
-                    int(grid_data[3]) if len(grid_data) > 3 and grid_data[3].isdigit() else None,
-                    grid_data[4] if len(grid_data) > 4 else None,
-                    grid_data[5] if len(grid_data) > 5 else None,
-                    preview_id
-                ))
+    # DeviceType == LOR, then LOR props with multiple ChannelGrid groups
+    for groups, spare_rule in ((lor_groups, True), (lor_multi_groups, False)):
+        for LORComment, group in groups.items():
+            master_prop, master_grids = group["master"]
+            master_prop_id = master_prop.get("id")
+            name = master_prop.get("Name", "")
+            device_type = master_prop.get("DeviceType", "LOR")
+
+            # Special Rule: If "spare" is in the Name, insert directly into the props table
+            if spare_rule and "spare" in name.lower():
+                file_prop_ids.add(master_prop_id)
+                for grid in master_grids:
+                    add_prop((master_prop_id, name, LORComment, device_type, *grid, preview_id))
                 if DEBUG:
                     print(f"[DEBUG] Inserted Spare Prop: {master_prop_id}")
-            continue  # Skip further processing for this prop
-
-        # Check for duplicate PropID before inserting master prop
-        if handle_duplicate_prop(
-            cursor,
-            master_prop_id,
-            name,
-            LORComment,
-            device_type,
-            preview_id,
-            "Duplicate PropID detected"
-        ):
-            continue  # Skip duplicate
+                continue  # Skip further processing for this prop
 
-        # Insert master prop into the props table
-        grid_parts = channel_grid.split(";") if channel_grid else []
-        for grid in grid_parts:
-            grid_data = grid.split(",")
-            cursor.execute("""
-            INSERT OR REPLACE INTO props (
-                PropID, Name, LORComment, DeviceType, Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                master_prop_id,
-                name,
-                LORComment,
-                device_type,
-                grid_data[0] if len(grid_data) > 0 else None,
-                grid_data[1] if len(grid_data) > 1 else None,
-                int(grid_data[2]) if len(grid_data) > 2 and grid_data[2].isdigit() else None,
-                int(grid_data[3]) if len(grid_data) > 3 and grid_data[3].isdigit() else None,
-                grid_data[4] if len(grid_data) > 4 else None,
-                grid_data[5] if len(grid_data) > 5 else None,
-                preview_id
-            ))
-        if DEBUG:
-            print(f"[DEBUG] Inserted Master Prop: {master_prop_id}")
+            # Check for duplicate PropID before inserting master prop
+            if is_duplicate(dup_rows, seen_prop_ids, file_prop_ids, master_prop_id, name, LORComment, device_type, preview_id, reason):
+                continue  # Skip duplicate
 
-        # Insert remaining props into the subProps table
-        for prop in props:
-            if prop.get("id") == master_prop_id:
-                continue  # Skip the master prop
-
-            prop_id = prop.get("id")
-            channel_grid = prop.get("ChannelGrid", "")
-            sub_grid_parts = channel_grid.split(";") if channel_grid else []
-
-            for grid in sub_grid_parts:
-                grid_data = grid.split(",")
-                cursor.execute("""
-                INSERT OR REPLACE INTO subProps (
-                    SubPropID, Name, LORComment, DeviceType, Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    prop_id,
-                    prop.get("Name", ""),
-                    LORComment,
-                    "LOR",
-                    grid_data[0] if len(grid_data) > 0 else None,
-                    grid_data[1] if len(grid_data) > 1 else None,
-                    int(grid_data[2]) if len(grid_data) > 2 and grid_data[2].isdigit() else None,
-                    int(grid_data[3]) if len(grid_data) > 3 and grid_data[3].isdigit() else None,
-                    grid_data[4] if len(grid_data) > 4 else None,
-                    grid_data[5] if len(grid_data) > 5 else None,
-                    preview_id
-                ))
+            for grid in master_grids:
+                add_prop((master_prop_id, name, LORComment, device_type, *grid, preview_id))
+            if DEBUG:
+                print(f"[DEBUG] Inserted Master Prop: {master_prop_id}")
+
+            # Remaining props into the subProps table
+            for prop, grids in group["members"]:
+                prop_id = prop.get("id")
+                if prop_id == master_prop_id:
+                    continue  # Skip the master prop
+                prop_name = prop.get("Name", "")
+                for grid in grids:
+                    add_subprop((prop_id, prop_name, LORComment, device_type, *grid, preview_id))
                 if DEBUG:
                     print(f"[DEBUG] Inserted SubProp: {prop_id}")
 
-    conn.commit()
-    conn.close()
+    cursor.executemany(PROP_NONE_SQL, none_rows)
+    cursor.executemany(PROP_GRID_SQL, last_row_per_id(props_rows))
+    cursor.executemany(SUBPROP_GRID_SQL, last_row_per_id(subprops_rows))
+    cursor.executemany(DMX_CHANNEL_SQL, dmx_rows)
+    cursor.executemany(DUPLICATE_PROP_SQL, dup_rows)
 
 
-def process_lor_multiple_channel_grids(preview_id, root):
-    """
-    Process props with DeviceType == LOR and multiple ChannelGrid groups:
-    - Group props by LORComment.
-    - Identify the prop with the lowest StartChannel as the master prop for the group and write it to the props table.
-    - Process remaining props as subprops, including their ChannelGrid groups.
-    - Applies the naming convention to both props and subprops.
-    - Check for duplicates using the duplicateProps table.
+def parse_file(file_path):
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-
-    # Ensure the duplicateProps table exists
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS duplicateProps (
-        PropID TEXT PRIMARY KEY,
-        Name TEXT,
-        LORComment TEXT,
-        DeviceType TEXT,
-        PreviewId TEXT,
-        Reason TEXT
-    )
-    """)
-
-    # Group props by LORComment
-    props_grouped_by_comment = defaultdict(list)
-    for prop in root.findall(".//PropClass"):
-        device_type = prop.get("DeviceType")
-        if device_type == "LOR" and ";" in prop.get("ChannelGrid", ""):
-            LORComment = prop.get("Comment", "")
-            props_grouped_by_comment[LORComment].append(prop)
-
-    # Process each group of props by LORComment
-    for LORComment, props in props_grouped_by_comment.items():
-        # Identify the master prop (lowest StartChannel)
-        master_prop = min(
-            props,
-            key=lambda x: int(x.get("ChannelGrid", "").split(",")[2])
-            if x.get("ChannelGrid") and len(x.get("ChannelGrid").split(",")) > 2 and x.get("ChannelGrid").split(",")[2].isdigit()
-            else float("inf")
-        )
-
-        master_prop_id = master_prop.get("id")
-        master_name = master_prop.get("Name", "")
-        device_type = master_prop.get("DeviceType", "LOR")
-        master_channel_grid = master_prop.get("ChannelGrid", "")
-        master_grid_parts = master_channel_grid.split(";") if master_channel_grid else []
-
-        # Check for duplicate PropID before inserting master prop
-        if handle_duplicate_prop(
-            cursor,
-            master_prop_id,
-            master_name,
-            LORComment,
-            device_type,
-            preview_id,
-            "Duplicate PropID detected"
-        ):
-            continue  # Skip duplicate
-
-        # Insert master prop into the props table
-        for grid in master_grid_parts:
-            grid_data = grid.split(",")
-            cursor.execute("""
-            INSERT OR REPLACE INTO props (
-                PropID, Name, LORComment, DeviceType, Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                master_prop_id,
-                master_name,
-                LORComment,
-                device_type,
-                grid_data[0] if len(grid_data) > 0 else None,
-                grid_data[1] if len(grid_data) > 1 else None,
-                int(grid_data[2]) if len(grid_data) > 2 and grid_data[2].isdigit() else None,
-                int(grid_data[3]) if len(grid_data) > 3 and grid_data[3].isdigit() else None,
-                grid_data[4] if len(grid_data) > 4 else None,
-                grid_data[5] if len(grid_data) > 5 else None,
-                preview_id
-            ))
-        if DEBUG:
-            print(f"[DEBUG] Inserted Master Prop: {master_prop_id}")
-
-        # Process remaining props as subprops
-        for prop in props:
-            if prop.get("id") == master_prop_id:
-                continue  # Skip the master prop
-
-            subprop_id = prop.get("id")
-            subprop_name = prop.get("Name", "")
-            subprop_channel_grid = prop.get("ChannelGrid", "")
-            subprop_grid_parts = subprop_channel_grid.split(";") if subprop_channel_grid else []
-
-            for grid in subprop_grid_parts:
-                grid_data = grid.split(",")
-                cursor.execute("""
-                INSERT OR REPLACE INTO subProps (
-                    SubPropID, Name, LORComment, DeviceType, Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    subprop_id,
-                    subprop_name,
-                    LORComment,
-                    device_type,
-                    grid_data[0] if len(grid_data) > 0 else None,
-                    grid_data[1] if len(grid_data) > 1 else None,
-                    int(grid_data[2]) if len(grid_data) > 2 and grid_data[2].isdigit() else None,
-                    int(grid_data[3]) if len(grid_data) > 3 and grid_data[3].isdigit() else None,
-                    grid_data[4] if len(grid_data) > 4 else None,
-                    grid_data[5] if len(grid_data) > 5 else None,
-                    preview_id
-                ))
-                if DEBUG:
-                    print(f"[DEBUG] Inserted SubProp: {subprop_id}")
-
-    conn.commit()
-    conn.close()
-
-
-
-
-
-
-
-
+    Read one .lorprev file and bucket its props. Touches no database, so it can run in a worker process.
 
+    Returns:
+        tuple: (preview_data, buckets), or (None, None) if the file has no usable <PreviewClass>.
+    """
+    try:
+        preview, props = read_lorprev(file_path)
+    except ET.ParseError as e:
+        print(f"[ERROR] Failed to parse {file_path}: {e}")
+        return None, None
+    if preview is None:
+        return None, None
+    return process_preview(preview), bucket_props(props)
 
-def process_file(file_path):
-    """Process a single .lorprev file."""
+def load_file(file_path, preview_data, buckets, conn, seen_prop_ids):
+    """
+    Write one parsed .lorprev file (see parse_file) over the import connection.
+    seen_prop_ids holds the PropIDs already in the props table; this file's PropIDs
+    are added once its transaction commits.
+    """
     print(f"[DEBUG] Processing file: {file_path}")
-    preview = locate_preview_class_deep(file_path)
-    if preview is not None:
-        preview_data = process_preview(preview)
-        insert_preview_data(preview_data)
-
-        # Parse and process DeviceType == None and DMX props
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        process_none_props(preview_data["id"], root)
-        process_dmx_props(preview_data["id"], root)
-        process_lor_props(preview_data["id"], root)
-        process_lor_multiple_channel_grids(preview_data["id"], root)
+    if preview_data is not None:
+        # One transaction for the whole file
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            file_prop_ids = set()  # PropIDs this file writes, for the duplicate checks
+            insert_preview_data(cursor, preview_data)
+
+            # Process DeviceType == None, DMX and LOR props
+            process_all_props(cursor, preview_data["id"], buckets, seen_prop_ids, file_prop_ids)
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        seen_prop_ids |= file_prop_ids
     else:
         print(f"[WARNING] No <PreviewClass> found in {file_path}")
 
+def process_file(file_path):
+    """Process a single .lorprev file."""
+    conn = open_import_connection()
+    try:
+        seen_prop_ids = {row[0] for row in conn.execute("SELECT PropID FROM props")}
+        load_file(file_path, *parse_file(file_path), conn, seen_prop_ids)
+    finally:
+        close_import_connection(conn)
+
 def process_folder(folder_path):
     """Process all .lorprev files in the specified folder."""
-    if not os.listdir(folder_path):
+    # One directory scan; DirEntry already carries the joined path and the file type
+    with os.scandir(folder_path) as entries:
+        entries = list(entries)
+    if not entries:
         print(f"[WARNING] No files found in folder: {folder_path}")
         return
 
-    for file_name in os.listdir(folder_path):
-        if file_name.endswith(".lorprev"):
-            file_path = os.path.join(folder_path, file_name)
-            process_file(file_path)
+    # Sorted so duplicate PropIDs resolve the same way on every run
+    file_paths = sorted(
+        entry.path for entry in entries
+        if entry.name.endswith(".lorprev") and entry.is_file()
+    )
+
+    # XML parsing runs in worker processes; this process is the only SQLite writer and
+    # loads the files in listing order, so duplicate detection matches a serial run
+    conn = open_import_connection()
+    try:
+        # PropIDs already in the props table, read once; load_file adds each file's after its COMMIT
+        seen_prop_ids = {row[0] for row in conn.execute("SELECT PropID FROM props")}
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for file_path, parsed in zip(file_paths, executor.map(parse_file, file_paths)):
+                load_file(file_path, *parsed, conn, seen_prop_ids)
+    finally:
+        close_import_connection(conn)
 
 def main():
     """Main entry point for the script."""
@@ -681,6 +612,9 @@ def main():
 
     # Process all files in the folder
     process_folder(folder_path)
+
+    # Index after the bulk load
+    create_indexes()
     print("Processing complete. Check the database.")
 
 if __name__ == "__main__":
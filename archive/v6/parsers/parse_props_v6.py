@@ -1,7 +1,7 @@
 # MSB Database — LOR Preview Parser (v6)
 # Initial Release : 2022-01-20  V0.1.0
 # Version : 2025-11-02  V6.8.0
-# Current Version: 2026-02-26 V6.8.3
+# Current Version: 2026-10-17 V6.9.0
 # Author: Greg Liebig, Engineering Innovations, LLC.
 #
 # Purpose
@@ -15,6 +15,50 @@
 #
 # Revision History
 # ----------------
+## 2026-10-17  V6.9.0  (GAL)
+# • Ingest performance pass (no change to parsed output):
+#   – props/subProps/dmxChannels rows are queued per preview and written with executemany
+#     (BATCH_SIZE rows per call); collision checks keep the safe_insert_* rules and messages.
+#   – main() opens ONE sqlite3 connection for setup + all preview files and passes it through
+#     setup_database / insert_preview_data / process_* (no per-function connect/close).
+#   – Import connection applies IMPORT_PRAGMAS (WAL, synchronous=OFF, 64 MB cache, memory temp
+#     store, mmap, exclusive lock, FK checks off); the DB is returned to journal_mode=DELETE on close.
+#   – Each preview file is ingested in ONE transaction (process_folder: `with conn:`); the
+#     per-handler commits are gone.
+#   – PropClass nodes are walked once per file (bucket_prop_nodes) and handed to the handlers
+#     by DeviceType, with an id→node dict for manual MasterPropId lookups.
+#   – XML is parsed once per file with lxml iterparse (stdlib ElementTree fallback); PropClass
+#     geometry children are dropped while streaming and each PreviewClass is freed after use.
+#   – INSERT statements hoisted to module constants (INSERT_PROPS_SQL, INSERT_SUBPROPS_SQL,
+#     INSERT_DMX_*, INSERT_NONE_*), shared by every handler and file.
+#   – Lights: Parm2 fetched once per row and converted with safe_int(p2, 0).
+#   – Row builders bind get = <node>.get once instead of ~25 prop.get attribute lookups.
+#   – process_folder parses files in a ProcessPoolExecutor (PARSE_WORKERS); workers return
+#     plain attribute dicts and the main process does every DB write in sorted file order.
+#   – Import connection runs with isolation_level=None; each file is an explicit
+#     BEGIN IMMEDIATE … COMMIT (ROLLBACK on error).
+#   – process_none_props: masters keyed straight into masters_by_display (duplicates tracked
+#     only when they occur); linked units skipped before building a record unless
+#     WRITE_LINKED_TO_SUBPROPS.
+#   – lxml iterparse is tag-filtered (ITERPARSE_TAGS: {*}PreviewClass, PropClass), so other
+#     elements never reach the Python loop; stdlib fallback keeps the tag checks.
+#   – dmxChannels legs use plain INSERT (the table has no unique key to replace on).
+#   – LOR SPARE and relocated-master props rows built by one _prop_tuple() helper.
+#   – ChannelGrid parsers cap split(",") and strip only the fields they keep.
+#   – executemany_chunked accepts generators (islice chunks); DMX legs are streamed.
+#   – collapse/reconcile/wiring views connect through open_db() (POST_IMPORT_PRAGMAS:
+#     64 MB cache, temp_store=MEMORY).
+#   – locate_preview_class_deep copies each PropClass's attributes as it closes and releases
+#     the element (clear + drop earlier siblings), yielding (preview, prop_nodes). Same scope
+#     as before: the first PreviewClass, with every PropClass in the file.
+#   – bucket_prop_nodes also splits LOR into single-grid ("LOR") and multi-grid ("LOR_MULTI"),
+#     so the LOR passes no longer re-test ChannelGrid for ";" on every node.
+#   – Multi-grid: per-prop attributes read once, not once per grid segment; parse_grid,
+#     uid_sort_key and first_token moved to module scope.
+#   – Multi-grid subprop id/name built with single f-strings (no per-leg list + join);
+#     first_token() memoized.
+#   – process_folder lists the preview folder with os.scandir.
+#
 ## 2026-02-26  V6.8.3  (GAL)
 # • Fix StageID parsing to support sub-stages and animation ordering:
 #   – Support park stage tokens as NN or NNa (e.g., 07, 07a).
@@ -111,10 +155,19 @@
 
 import os
 import sys
-import xml.etree.ElementTree as ET
+try:
+    from lxml import etree as ET  # C parser + iterparse element freeing on large previews
+    # lxml can filter iterparse events itself, so only these tags reach Python
+    ITERPARSE_TAGS = {"tag": ("{*}PreviewClass", "PropClass")}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    ITERPARSE_TAGS = {}
 import sqlite3
 import pathlib
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 import uuid
 from pathlib import Path
 import re
@@ -692,9 +745,10 @@ def safe_int(s, default=None):
     return int(s) if s.isdigit() else default
 
 # --- Pre-scan: which display names clearly belong to channel-bearing props?
-def collect_channel_display_names(xml_root) -> set[str]:
+def collect_channel_display_names(prop_nodes) -> set[str]:
     """
     Return lowercased LORComment values that should be owned by LOR/DMX paths.
+    prop_nodes: every PropClass node of the preview (see bucket_prop_nodes).
     We flag a node as 'channel-bearing' if:
       - DeviceType is LOR or DMX, OR
       - it has a non-empty ChannelGrid, OR
@@ -705,7 +759,7 @@ def collect_channel_display_names(xml_root) -> set[str]:
     def _t(s):  # normalize strings (lowercase/trim)
         return (s or "").strip().lower()
 
-    for node in xml_root.findall(".//PropClass"):
+    for node in prop_nodes:
         dev = (node.get("DeviceType") or "").strip().upper()
         # lorcomment = _t(node.get("LORComment")) GAL 25-09-20
         # GAL 25-10-16: Comment→DisplayName hygiene should match lor_core.validate_display_name()
@@ -738,6 +792,36 @@ def collect_channel_display_names(xml_root) -> set[str]:
 
     return channelish
 
+# --- Single pass over the preview's PropClass nodes --------------------------
+def bucket_prop_nodes(prop_nodes):
+    """
+    Walk the preview's PropClass nodes ONCE and return (props_by_device, id_to_prop):
+      - props_by_device: {"None": [...], "DMX": [...], "LOR": [...], "LOR_MULTI": [...]}
+                         using the same DeviceType tests the process_* handlers applied
+                         themselves; LOR is split on ";" in ChannelGrid (single- vs multi-grid)
+      - id_to_prop:      {PropClass.id: node} for O(1) MasterPropId lookups
+    prop_nodes are the attribute dicts from parse_preview_file() (document order);
+    anything answering .get() works. Replaces one root.findall(".//PropClass") scan
+    per handler/pass.
+    """
+    props_by_device = {"None": [], "DMX": [], "LOR": [], "LOR_MULTI": []}
+    id_to_prop = {}
+    for node in prop_nodes:
+        id_to_prop[node.get("id")] = node
+        dev = node.get("DeviceType")
+        if dev == "LOR":
+            if ";" in (node.get("ChannelGrid") or ""):
+                props_by_device["LOR_MULTI"].append(node)
+            else:
+                props_by_device["LOR"].append(node)
+        else:
+            dev = (dev or "").strip()
+            if dev == "None":
+                props_by_device["None"].append(node)
+            elif dev.upper() == "DMX":
+                props_by_device["DMX"].append(node)
+    return props_by_device, id_to_prop
+
 # ---------- Notification when DB Updated 25-09-20 GAL -----------------------------
 from pathlib import Path
 from datetime import datetime
@@ -896,9 +980,60 @@ PROP_ID_COL     = "PropID"       # LOR-generated prop GUID (join key downstream)
 PROP_NAME_COL   = "Name"         # Human channel name (from XML Name)
 
 
-def setup_database():
+# Import-time SQLite tuning. The parser is the only writer while it rebuilds the DB,
+# so trade durability of the half-built file for speed; the DB is rebuilt from the
+# .lorprev files anyway if a run dies part-way.
+IMPORT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",          # no fsyncs at all; see note above
+    "PRAGMA cache_size=-65536",        # 64 MB page cache
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",      # 256 MB
+    "PRAGMA locking_mode=EXCLUSIVE",   # sole writer during import
+    "PRAGMA foreign_keys=OFF",         # no per-row FK checks while loading
+)
+
+def open_import_connection(db_file):
+    """
+    Open the import connection and apply IMPORT_PRAGMAS.
+    isolation_level=None: no implicit BEGINs from the sqlite3 module — process_folder
+    issues BEGIN IMMEDIATE / COMMIT around each preview file itself.
+    """
+    conn = sqlite3.connect(db_file, isolation_level=None)
+    for pragma in IMPORT_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+# Per-connection (non-persistent) settings for the post-import passes that open their
+# own connection (collapse, reconcile, wiring views): bigger cache, temp B-trees in RAM.
+POST_IMPORT_PRAGMAS = (
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+def open_db(db_file):
+    """Open a post-import connection with POST_IMPORT_PRAGMAS (journal mode untouched)."""
+    conn = sqlite3.connect(db_file)
+    for pragma in POST_IMPORT_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def close_import_connection(conn):
+    """
+    Undo the import-only settings and close.
+    The DB lives on the shared drive and is read by other tools, so leave it in the
+    default rollback-journal mode (no -wal/-shm side files).
+    """
+    try:
+        if conn.in_transaction:
+            # journal_mode can't change inside a transaction (it silently stays 'wal')
+            conn.execute("ROLLBACK")
+        conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        conn.close()
+
+def setup_database(conn):
     """Initialize the database schema, dropping tables if they already exist."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
 
     # Drop tables if they exist
@@ -1034,23 +1169,53 @@ def setup_database():
     """)
 
     conn.commit()
-    conn.close()
     print("[DEBUG] Database setup complete, all tables created.")
 
+def _release(element):
+    """
+    clear() a finished element and, under lxml, drop its earlier siblings from the parent.
+    The root PreviewClass has no parent (a comment/PI before it is still its previous
+    sibling), so it is only cleared.
+    """
+    element.clear()
+    parent = element.getparent() if hasattr(element, "getparent") else None
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
 def locate_preview_class_deep(file_path):
-    """Locate the PreviewClass element at any depth in the XML tree."""
+    """
+    Stream the file with iterparse and yield (preview, prop_nodes) once, for the first
+    PreviewClass at any depth. Nothing is yielded if there is none or the XML is broken.
+
+    preview: that PreviewClass's attributes as a plain dict.
+    prop_nodes: attributes of every PropClass in the file (also any outside the
+    PreviewClass, or inside a later one), as plain dicts in document order. Only
+    attributes are read downstream, so each PropClass is copied and released the
+    moment it closes; the tree never holds the whole document.
+    """
+    preview = None
+    prop_nodes = []
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-
-        # Deep search for PreviewClass
-        for element in root.iter():
-            if element.tag.endswith("PreviewClass"):  # Handle namespaces or simple tag names
-                return element
-        return None
+        for event, element in ET.iterparse(file_path, events=("start", "end"), **ITERPARSE_TAGS):
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue  # comments / processing instructions (stdlib: no tag filter)
+            if tag == "PropClass":
+                if event == "end":
+                    prop_nodes.append(dict(element.attrib))
+                    _release(element)
+            elif tag.endswith("PreviewClass"):  # Handle namespaces or simple tag names
+                if event == "start":
+                    if preview is None:
+                        preview = dict(element.attrib)
+                else:
+                    _release(element)
     except ET.ParseError as e:
         print(f"[ERROR] Failed to parse {file_path}: {e}")
-        return None
+        return
+    if preview is not None:
+        yield preview, prop_nodes
 
 def process_preview(preview):
     """Extract and return data from the <PreviewClass> element."""
@@ -1184,11 +1349,176 @@ def safe_insert_prop(cursor, insert_sql: str, params: tuple | list, incoming_con
 # -----------------------------------------------------------------------------
 
 # -----------------------------------------------------------------------------
+# Import INSERT statements — built once so every handler/file reuses the same
+# string objects (and sqlite3's statement cache stays warm across previews).
+# Row tuples in the handlers follow these column orders exactly.
+# -----------------------------------------------------------------------------
+INSERT_PROPS_SQL = """
+    INSERT INTO props (
+        PropID, Name, LORComment, DeviceType, BulbShape, DimmingCurveName, MaxChannels,
+        CustomBulbColor, IndividualChannels, LegacySequenceMethod, Opacity, MasterDimmable,
+        PreviewBulbSize, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
+        EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights,
+        Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_SUBPROPS_SQL = """
+    INSERT INTO subProps (
+        SubPropID, Name, LORComment, DeviceType, BulbShape, Network, UID, StartChannel,
+        EndChannel, Unknown, Color, CustomBulbColor, DimmingCurveName, IndividualChannels,
+        LegacySequenceMethod, MaxChannels, Opacity, MasterDimmable, PreviewBulbSize, RgbOrder,
+        MasterPropId, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
+        EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights, PreviewId
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
+# PropClass attributes copied as-is into an INSERT_PROPS_SQL row (DeviceType … Lights),
+# and the parsed ChannelGrid fields that follow Lights
+_PROP_COLS = (
+    "BulbShape", "DimmingCurveName", "MaxChannels", "CustomBulbColor", "IndividualChannels",
+    "LegacySequenceMethod", "Opacity", "MasterDimmable", "PreviewBulbSize", "SeparateIds",
+    "StartLocation", "StringType", "TraditionalColors", "TraditionalType", "EffectBulbSize", "Tag",
+    "Parm1", "Parm2", "Parm3", "Parm4", "Parm5", "Parm6", "Parm7", "Parm8",
+)
+_GRID_COLS = ("Network", "UID", "StartChannel", "EndChannel", "Unknown", "Color")
+
+def _prop_tuple(prop, prop_id, name, comment, grid, preview_id, device_type="LOR") -> tuple:
+    """INSERT_PROPS_SQL row for one single-grid PropClass node; grid is its parsed ChannelGrid dict."""
+    get = prop.get
+    return (
+        (prop_id, name, comment, device_type)
+        + tuple(map(get, _PROP_COLS))
+        + (safe_int(get("Parm2"), 0),)     # Lights
+        + tuple(map(grid.get, _GRID_COLS))
+        + (preview_id,)
+    )
+
+# DMX masters carry no Network/UID/channel columns (legs go to dmxChannels)
+INSERT_DMX_PROPS_SQL = """
+    INSERT INTO props (
+        PropID, Name, LORComment, DeviceType, BulbShape, DimmingCurveName,
+        MaxChannels, CustomBulbColor, IndividualChannels, LegacySequenceMethod,
+        Opacity, MasterDimmable, PreviewBulbSize, SeparateIds, StartLocation,
+        StringType, TraditionalColors, TraditionalType, EffectBulbSize, Tag,
+        Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights, PreviewId
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# dmxChannels has no key besides its AUTOINCREMENT rowid, so OR REPLACE could never fire
+INSERT_DMX_CHANNELS_SQL = """
+    INSERT INTO dmxChannels (
+        PropId, Network, StartUniverse, StartChannel, EndChannel, Unknown, PreviewId
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
 
-def insert_preview_data(preview_data):
+INSERT_NONE_PROPS_SQL = """
+    INSERT INTO props (
+        PropID, Name, LORComment, DeviceType,
+        BulbShape, DimmingCurveName, MaxChannels,
+        CustomBulbColor, IndividualChannels, LegacySequenceMethod,
+        Opacity, MasterDimmable, PreviewBulbSize, SeparateIds, StartLocation,
+        StringType, TraditionalColors, TraditionalType, EffectBulbSize, Tag,
+        Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8,
+        Lights, PreviewId, MasterPropId
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+              ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_NONE_SUBPROPS_SQL = """
+    INSERT INTO subProps (
+        SubPropID, MasterPropId,
+        Name, LORComment, DeviceType,
+        Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8,
+        PreviewId
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# -----------------------------------------------------------------------------
+# Batched inserts (executemany) — same collision rules as safe_insert_prop/subprop
+# -----------------------------------------------------------------------------
+BATCH_SIZE = 500  # rows per executemany call; also caps IN (...) lookups under SQLite's 999 bound params
+
+def executemany_chunked(cursor, insert_sql: str, rows):
+    """
+    Run insert_sql for all rows, BATCH_SIZE rows per executemany call.
+    rows may be any iterable (list or generator); at most BATCH_SIZE rows are held at once.
+    """
+    rows = iter(rows)
+    while chunk := list(islice(rows, BATCH_SIZE)):
+        cursor.executemany(insert_sql, chunk)
+
+def _existing_ids(cursor, table: str, key_col: str, ids) -> set:
+    """Return the subset of ids already present in table.key_col."""
+    ids = list(ids)
+    found = set()
+    for i in range(0, len(ids), BATCH_SIZE):
+        chunk = ids[i:i + BATCH_SIZE]
+        cursor.execute(
+            f"SELECT {key_col} FROM {table} WHERE {key_col} IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        found.update(r[0] for r in cursor.fetchall())
+    return found
+
+def _safe_insert_batch(cursor, insert_sql: str, batch: list, table: str, key: str, safe_insert_one):
+    """
+    Flush queued (params, incoming_context, debug) rows in their original order.
+    - Rows whose key is missing or already taken (in the DB or earlier in this batch)
+      go through safe_insert_one() so the ERROR/collision record is exactly as before.
+    - Everything else is written with executemany, BATCH_SIZE rows at a time.
+    debug is None or a (head, tail) pair printed as "[DEBUG] head INSERT|SKIP tail".
+    """
+    if not batch:
+        return
+    taken = _existing_ids(cursor, table, key, {ctx.get(key) for _, ctx, _ in batch if ctx.get(key)})
+    pending = []
+
+    def _report(entry, ok):
+        debug = entry[2]
+        if DEBUG and debug:
+            print(f"[DEBUG] {debug[0]} {'INSERT' if ok else 'SKIP (collision/error)'}{debug[1]}")
+
+    def _flush():
+        if not pending:
+            return
+        ok = True
+        try:
+            cursor.executemany(insert_sql, [params for params, _, _ in pending])
+        except Exception as e:
+            ok = False
+            ERROR(f"DB error inserting {len(pending)} {table} rows: {e}", ctx=pending[0][1].get("PreviewId"))
+        for entry in pending:
+            _report(entry, ok)
+        pending.clear()
+
+    for entry in batch:
+        params, ctx, _ = entry
+        rid = ctx.get(key)
+        if not rid or rid in taken:
+            _flush()
+            _report(entry, safe_insert_one(cursor, insert_sql, params, ctx))
+            continue
+        taken.add(rid)
+        pending.append(entry)
+        if len(pending) >= BATCH_SIZE:
+            _flush()
+    _flush()
+
+def safe_insert_props_batch(cursor, insert_sql: str, batch: list):
+    """Batched safe_insert_prop(): batch is [(params, incoming_context, debug), ...]."""
+    _safe_insert_batch(cursor, insert_sql, batch, "props", "PropID", safe_insert_prop)
+
+def safe_insert_subprops_batch(cursor, insert_sql: str, batch: list):
+    """Batched safe_insert_subprop(): batch is [(params, incoming_context, debug), ...]."""
+    _safe_insert_batch(cursor, insert_sql, batch, "subProps", "SubPropID", safe_insert_subprop)
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+
+
+def insert_preview_data(preview_data, conn):
     """Insert preview data into the database."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -1203,8 +1533,6 @@ def insert_preview_data(preview_data):
         preview_data["BackgroundFile"]
     ))
 
-    conn.commit()
-    conn.close()
     if DEBUG:
         print(f"[DEBUG] Inserted Preview into database: {preview_data}")
 
@@ -1216,7 +1544,7 @@ def reconcile_subprops_to_canonical_master(db_file: str):
     Choose ONE of the two SQL blocks below (A or B) and keep only that one.
     """
     import sqlite3
-    conn = sqlite3.connect(db_file)
+    conn = open_db(db_file)
     try:
         sql = r"""
         -- === OPTION B (matches Python's (UID, StartChannel) ordering) ===
@@ -1317,7 +1645,8 @@ def reconcile_subprops_to_canonical_master(db_file: str):
 
     Inputs
       - preview_id: id of the <PreviewClass>.
-      - root: ElementTree root of the preview XML.
+      - none_props: PropClass nodes with DeviceType "None" (bucket_prop_nodes()["None"]).
+      - conn: open sqlite3 connection shared by the whole import.
       - skip_display_names: optional set of LORComment strings to ignore (case-sensitive).
 
     Outputs
@@ -1334,7 +1663,7 @@ def reconcile_subprops_to_canonical_master(db_file: str):
         harden the wiring view to exclude DeviceType='None' on the sub-prop leg.
     """
 
-def process_none_props(preview_id, root, skip_display_names: set[str] | None = None):
+def process_none_props(preview_id, none_props, conn, skip_display_names: set[str] | None = None):
     """
     DeviceType == "None" (masters-only to props; linked units ignored by default)
     Policy (per user spec):
@@ -1345,7 +1674,6 @@ def process_none_props(preview_id, root, skip_display_names: set[str] | None = N
 
     WRITE_LINKED_TO_SUBPROPS = False  # set True if you want to keep linked units in subProps for reference
 
-    conn = sqlite3.connect(DB_FILE)
     cur = conn.cursor()
 
     def _scoped(preview_id: str, raw_id: str | None) -> str | None:
@@ -1356,20 +1684,23 @@ def process_none_props(preview_id, root, skip_display_names: set[str] | None = N
 
     # Pass 0: collect NONE records
     # We’ll detect duplicate masters per DisplayName to avoid ambiguous inventory.
+    # First master per DisplayName goes straight into masters_by_display; the
+    # (rare) duplicates are the only thing kept in a per-display list.
     masters_by_display: dict[str, dict] = {}
     linked_rows: list[dict] = []
-    seen_master_displaynames: dict[str, list[dict]] = {}
-
-    for prop in root.findall(".//PropClass"):
-        if (prop.get("DeviceType") or "").strip() != "None":
-            continue
+    dup_masters_by_display: dict[str, list[dict]] = {}
 
+    for prop in none_props:
         comment = (prop.get("Comment") or "").strip()
         if not comment:
             continue
         if skip_display_names and comment in skip_display_names:
             continue
 
+        master_raw = (prop.get("MasterPropId") or prop.get("UseSameChannelAs") or "").strip()
+        if master_raw and not WRITE_LINKED_TO_SUBPROPS:
+            continue  # linked unit, ignored by policy → don't build its record
+
         rec = {
             "raw_id":              (prop.get("id") or "").strip(),
             "name":                prop.get("Name") or "",
@@ -1398,31 +1729,32 @@ def process_none_props(preview_id, root, skip_display_names: set[str] | None = N
             "legacy_method":       prop.get("LegacySequenceMethod"),
             "individual_ch":       prop.get("IndividualChannels"),
             "master_dimmable":     prop.get("MasterDimmable"),
-            "master_raw":          (prop.get("MasterPropId") or prop.get("UseSameChannelAs") or "").strip(),
+            "master_raw":          master_raw,
         }
 
-        if rec["master_raw"] == "":  # MASTER
+        if master_raw == "":  # MASTER
             # detect duplicate masters for same DisplayName
-            lst = seen_master_displaynames.setdefault(comment, [])
-            lst.append(rec)
+            first = masters_by_display.setdefault(comment, rec)
+            if first is not rec:
+                dup_masters_by_display.setdefault(comment, [first]).append(rec)
         else:  # LINKED
             linked_rows.append(rec)
 
     # Guardrail: error if >1 master per DisplayName in this preview
-    dup_masters = [dn for dn, lst in seen_master_displaynames.items() if len(lst) > 1]
-    if dup_masters:
+    if dup_masters_by_display:
         print("[ERROR] Multiple MASTER inventory records for the same DisplayName within a single preview (DeviceType=None).")
-        for dn in dup_masters:
-            names = ", ".join((r["name"] or r["raw_id"] or "?") for r in seen_master_displaynames[dn])
-            print(f"  - PreviewId={preview_id} DisplayName='{dn}' has {len(seen_master_displaynames[dn])} masters: {names}")
+        for dn in masters_by_display:  # first-seen order
+            lst = dup_masters_by_display.get(dn)
+            if not lst:
+                continue
+            names = ", ".join((r["name"] or r["raw_id"] or "?") for r in lst)
+            print(f"  - PreviewId={preview_id} DisplayName='{dn}' has {len(lst)} masters: {names}")
         raise SystemExit(2)
 
-    # Build final maps
-    for dn, lst in seen_master_displaynames.items():
-        masters_by_display[dn] = lst[0]  # the only one (we just enforced uniqueness)
-
     # Pass 1: insert MASTERS to props
     # Pass 1: insert MASTERS to props (with local fan-out for DeviceType=None)
+    # Rows are collected here and written with executemany below.
+    master_rows = []
     for dn, m in masters_by_display.items():
         base_scoped = _scoped(preview_id, m["raw_id"]) or f"{preview_id}:NONE"
 
@@ -1433,36 +1765,27 @@ def process_none_props(preview_id, root, skip_display_names: set[str] | None = N
         for i in range(1, count + 1):
             inst_id      = f"{base_scoped}-{i:02d}" if count > 1 else base_scoped
             inst_comment = f"{dn}-{i:02d}"           if count > 1 else dn
-            try:
-                cur.execute("""
-                    INSERT INTO props (
-                        PropID, Name, LORComment, DeviceType,
-                        BulbShape, DimmingCurveName, MaxChannels,
-                        CustomBulbColor, IndividualChannels, LegacySequenceMethod,
-                        Opacity, MasterDimmable, PreviewBulbSize, SeparateIds, StartLocation,
-                        StringType, TraditionalColors, TraditionalType, EffectBulbSize, Tag,
-                        Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8,
-                        Lights, PreviewId, MasterPropId
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                            ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    inst_id, m["name"], inst_comment, "None",
-                    m["bulb_shape"], m["dimming_curve_name"], m["max_ch"],
-                    m["custom_bulb_color"], m["individual_ch"], m["legacy_method"],
-                    m["opacity"], m["master_dimmable"], m["preview_bulb_size"], m["separate_ids"], m["start_location"],
-                    m["string_type"], m["traditional_colors"], m["traditional_type"], m["effect_bulb_size"], m["tag"],
-                    m["parm1"], m["parm2"], m["parm3"], m["parm4"], m["parm5"], m["parm6"], m["parm7"], m["parm8"],
-                    lights, preview_id, None
-                ))
-            except sqlite3.IntegrityError as e:
-                print(f"[ERROR] Duplicate PropID (None/MASTER): {inst_id} "
-                    f"(PreviewId={preview_id}, Display='{inst_comment}') -> {e}")
-                raise
+            master_rows.append((
+                inst_id, m["name"], inst_comment, "None",
+                m["bulb_shape"], m["dimming_curve_name"], m["max_ch"],
+                m["custom_bulb_color"], m["individual_ch"], m["legacy_method"],
+                m["opacity"], m["master_dimmable"], m["preview_bulb_size"], m["separate_ids"], m["start_location"],
+                m["string_type"], m["traditional_colors"], m["traditional_type"], m["effect_bulb_size"], m["tag"],
+                m["parm1"], m["parm2"], m["parm3"], m["parm4"], m["parm5"], m["parm6"], m["parm7"], m["parm8"],
+                lights, preview_id, None
+            ))
 
         if DEBUG:
             mode = "MASTER-FANOUT" if count > 1 else "MASTER"
             print(f"[NONE->{mode}] {base_scoped}  name='{m['name']}'  display='{dn}' x{count}")
 
+    try:
+        executemany_chunked(cur, INSERT_NONE_PROPS_SQL, master_rows)
+    except sqlite3.IntegrityError as e:
+        print(f"[ERROR] Duplicate PropID (None/MASTER) in PreviewId={preview_id} "
+              f"({len(master_rows)} rows) -> {e}")
+        raise
+
     # Pass 2: (optional) write LINKED units to subProps for reference; otherwise IGNORE
     if WRITE_LINKED_TO_SUBPROPS and linked_rows:
         # Pre-resolve master scoped ids by their DisplayName + raw master id
@@ -1471,6 +1794,7 @@ def process_none_props(preview_id, root, skip_display_names: set[str] | None = N
             for dn in masters_by_display
         }
 
+        linked_sub_rows = []
         for r in linked_rows:
             # only write if this linked row references a known master for its DisplayName
             dn = r["comment"]
@@ -1493,35 +1817,28 @@ def process_none_props(preview_id, root, skip_display_names: set[str] | None = N
             sub_scoped    = _scoped(preview_id, r["raw_id"]) or f"{preview_id}:NONE"
             master_scoped = master_scoped_by_raw[master_rec["raw_id"]]
 
-            try:
-                cur.execute("""
-                    INSERT INTO subProps (
-                        SubPropID, MasterPropId,
-                        Name, LORComment, DeviceType,
-                        Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8,
-                        PreviewId
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    sub_scoped, master_scoped,
-                    r["name"], dn, "None",
-                    r["parm1"], r["parm2"], r["parm3"], r["parm4"],
-                    r["parm5"], r["parm6"], r["parm7"], r["parm8"],
-                    preview_id
-                ))
-            except sqlite3.IntegrityError as e:
-                print(f"[ERROR] Duplicate SubPropID (None/LINK): {sub_scoped} "
-                      f"(Master={master_scoped}, Display='{dn}') -> {e}")
-                raise
+            linked_sub_rows.append((
+                sub_scoped, master_scoped,
+                r["name"], dn, "None",
+                r["parm1"], r["parm2"], r["parm3"], r["parm4"],
+                r["parm5"], r["parm6"], r["parm7"], r["parm8"],
+                preview_id
+            ))
 
             if DEBUG:
                 print(f"[NONE->SUB] {sub_scoped}  name='{r['name']}'  display='{dn}'  master='{master_scoped}'")
 
-    conn.commit()
-    conn.close()
+        try:
+            executemany_chunked(cur, INSERT_NONE_SUBPROPS_SQL, linked_sub_rows)
+        except sqlite3.IntegrityError as e:
+            print(f"[ERROR] Duplicate SubPropID (None/LINK) in PreviewId={preview_id} "
+                  f"({len(linked_sub_rows)} rows) -> {e}")
+            raise
+
 
 
 
-def process_dmx_props(preview_id, root):
+def process_dmx_props(preview_id, dmx_props, conn):
     """
     RULES
     -----
@@ -1535,7 +1852,7 @@ def process_dmx_props(preview_id, root):
       • Choose master by the smallest (StartUniverse, StartChannel); tie-break by PropID for determinism.
 
     Behavior
-      - For each PropClass with DeviceType == "DMX":
+      - For each PropClass with DeviceType == "DMX" (pre-bucketed by bucket_prop_nodes):
           * Write master metadata to `props` (PropID, Name, LORComment, etc.).
           * Parse ChannelGrid; for each "network,universe,start,end,unknown" leg:
               - Insert a row into `dmxChannels` with (PropId, Network, StartUniverse, StartChannel, EndChannel, Unknown).
@@ -1544,7 +1861,8 @@ def process_dmx_props(preview_id, root):
 
     Inputs
       - preview_id: string id of the <PreviewClass>.
-      - root: XML root (ElementTree).
+      - dmx_props: PropClass nodes with DeviceType "DMX" (bucket_prop_nodes()["DMX"]).
+      - conn: open sqlite3 connection shared by the whole import.
 
     Outputs
       - Inserts into `props` and `dmxChannels`.
@@ -1557,19 +1875,16 @@ def process_dmx_props(preview_id, root):
     from collections import defaultdict
 
     def norm(s): return (s or "").strip()
-    def safe_int(v, d=0):
+    # int() here accepts signs/padding in ChannelGrid; Lights uses the module-level safe_int
+    def to_int(v, d=0):
         try: return int(v)
         except: return d
 
-    conn = sqlite3.connect(DB_FILE)
     cur  = conn.cursor()
 
     # 1) Collect DMX rows and parse ChannelGrid
     groups = defaultdict(list)  # comment -> [row, ...]
-    for prop in root.findall(".//PropClass"):
-        if (prop.get("DeviceType") or "").strip().upper() != "DMX":
-            continue
-
+    for prop in dmx_props:
         # GAL 25-10-16: Comment→DisplayName hygiene should match lor_core.validate_display_name()
         comment = norm(prop.get("Comment"))
         if not comment:
@@ -1586,72 +1901,69 @@ def process_dmx_props(preview_id, root):
                 seg = seg.strip()
                 if not seg:
                     continue
-                parts = [p.strip() for p in seg.split(",")]
+                # Net,Universe,Start,End,Unknown[,…]: only the first five fields are used;
+                # int() strips, so only the text fields need .strip()
+                parts = seg.split(",", 5)
                 if len(parts) >= 5:
                     legs.append({
-                        "Network": parts[0],
-                        "StartUniverse": safe_int(parts[1], 0),
-                        "StartChannel":  safe_int(parts[2], 0),
-                        "EndChannel":    safe_int(parts[3], 0),
-                        "Unknown":       parts[4],
+                        "Network": parts[0].strip(),
+                        "StartUniverse": to_int(parts[1], 0),
+                        "StartChannel":  to_int(parts[2], 0),
+                        "EndChannel":    to_int(parts[3], 0),
+                        "Unknown":       parts[4].strip(),
                     })
 
         # Decide sort key (lowest universe, then channel; default high if missing)
         min_uni = min([l["StartUniverse"] for l in legs], default=10**9)
         min_ch  = min([l["StartChannel"]  for l in legs], default=10**9)
 
+        get = prop.get  # bound once; ~25 attribute reads below
+        p2 = get("Parm2")  # Parm2 doubles as the light count
         row = {
             "PropID": scoped,
             "RawID": raw_id,
-            "Name": prop.get("Name"),
+            "Name": get("Name"),
             "LORComment": comment,
             "DeviceType": "DMX",
-            "BulbShape": prop.get("BulbShape"),
-            "DimmingCurveName": prop.get("DimmingCurveName"),
-            "MaxChannels": prop.get("MaxChannels"),
-            "CustomBulbColor": prop.get("CustomBulbColor"),
-            "IndividualChannels": prop.get("IndividualChannels"),
-            "LegacySequenceMethod": prop.get("LegacySequenceMethod"),
-            "Opacity": prop.get("Opacity"),
-            "MasterDimmable": prop.get("MasterDimmable"),
-            "PreviewBulbSize": prop.get("PreviewBulbSize"),
-            "SeparateIds": prop.get("SeparateIds"),
-            "StartLocation": prop.get("StartLocation"),
-            "StringType": prop.get("StringType"),
-            "TraditionalColors": prop.get("TraditionalColors"),
-            "TraditionalType": prop.get("TraditionalType"),
-            "EffectBulbSize": prop.get("EffectBulbSize"),
-            "Tag": prop.get("Tag"),
-            "Parm1": prop.get("Parm1"),
-            "Parm2": prop.get("Parm2"),
-            "Parm3": prop.get("Parm3"),
-            "Parm4": prop.get("Parm4"),
-            "Parm5": prop.get("Parm5"),
-            "Parm6": prop.get("Parm6"),
-            "Parm7": prop.get("Parm7"),
-            "Parm8": prop.get("Parm8"),
-            "Lights": int(prop.get("Parm2")) if prop.get("Parm2") and str(prop.get("Parm2")).isdigit() else 0,
+            "BulbShape": get("BulbShape"),
+            "DimmingCurveName": get("DimmingCurveName"),
+            "MaxChannels": get("MaxChannels"),
+            "CustomBulbColor": get("CustomBulbColor"),
+            "IndividualChannels": get("IndividualChannels"),
+            "LegacySequenceMethod": get("LegacySequenceMethod"),
+            "Opacity": get("Opacity"),
+            "MasterDimmable": get("MasterDimmable"),
+            "PreviewBulbSize": get("PreviewBulbSize"),
+            "SeparateIds": get("SeparateIds"),
+            "StartLocation": get("StartLocation"),
+            "StringType": get("StringType"),
+            "TraditionalColors": get("TraditionalColors"),
+            "TraditionalType": get("TraditionalType"),
+            "EffectBulbSize": get("EffectBulbSize"),
+            "Tag": get("Tag"),
+            "Parm1": get("Parm1"),
+            "Parm2": p2,
+            "Parm3": get("Parm3"),
+            "Parm4": get("Parm4"),
+            "Parm5": get("Parm5"),
+            "Parm6": get("Parm6"),
+            "Parm7": get("Parm7"),
+            "Parm8": get("Parm8"),
+            "Lights": safe_int(p2, 0),
             "Legs": legs,
             "SortKey": (min_uni, min_ch, scoped)  # stable tie-break
         }
         groups[comment].append(row)
 
     # 2) Emit one master `props` row per comment; attach all legs to that master in `dmxChannels`
+    #    Rows are queued per preview and flushed with executemany at the end.
+    # GAL 25-10-22: use collision-aware insert (no silent overwrite)
+    props_batch = []
     for comment, arr in groups.items():
         arr.sort(key=lambda r: r["SortKey"])
         master = arr[0]
 
         # Master props row (single row per comment)
-        # GAL 25-10-22: use collision-aware insert (no silent overwrite)
-        insert_sql = """
-            INSERT INTO props (
-                PropID, Name, LORComment, DeviceType, BulbShape, DimmingCurveName,
-                MaxChannels, CustomBulbColor, IndividualChannels, LegacySequenceMethod,
-                Opacity, MasterDimmable, PreviewBulbSize, SeparateIds, StartLocation,
-                StringType, TraditionalColors, TraditionalType, EffectBulbSize, Tag,
-                Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights, PreviewId
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
         params = (
             master["PropID"], master["Name"], master["LORComment"], "DMX",
             master["BulbShape"], master["DimmingCurveName"], master["MaxChannels"],
@@ -1675,31 +1987,27 @@ def process_dmx_props(preview_id, root):
             "StartChannel": master.get("StartChannel", ""),
             "EndChannel":   master.get("EndChannel", ""),
         }
-        ok = safe_insert_prop(cur, insert_sql, params, incoming_ctx)
-        if DEBUG:
-            if ok:
-                print(f"[DEBUG] (DMX) master → props INSERT: {master['PropID']}  Display='{comment}'")
-            else:
-                print(f"[DEBUG] (DMX) master → props SKIP (collision/error): {master['PropID']}  Display='{comment}'")
-
-
-        # All legs from every member of the group get attached to the master
-        for r in arr:
-            for leg in r["Legs"]:
-                cur.execute("""
-                    INSERT OR REPLACE INTO dmxChannels (
-                        PropId, Network, StartUniverse, StartChannel, EndChannel, Unknown, PreviewId
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    master["PropID"], leg["Network"], leg["StartUniverse"],
-                    leg["StartChannel"], leg["EndChannel"], leg["Unknown"], preview_id
-                ))
-                if DEBUG:
-                    print(f"[DEBUG] (DMX) +leg master={master['PropID']} U={leg['StartUniverse']} S={leg['StartChannel']} E={leg['EndChannel']}")
-    conn.commit()
-    conn.close()
-
-def process_lor_props(preview_id, root):
+        debug = ("(DMX) master → props", f": {master['PropID']}  Display='{comment}'") if DEBUG else None
+        props_batch.append((params, incoming_ctx, debug))
+
+    def _leg_rows():
+        # All legs from every member of the group get attached to the master (arr[0], sorted above)
+        for arr in groups.values():
+            master = arr[0]
+            for r in arr:
+                for leg in r["Legs"]:
+                    if DEBUG:
+                        print(f"[DEBUG] (DMX) +leg master={master['PropID']} U={leg['StartUniverse']} S={leg['StartChannel']} E={leg['EndChannel']}")
+                    yield (
+                        master["PropID"], leg["Network"], leg["StartUniverse"],
+                        leg["StartChannel"], leg["EndChannel"], leg["Unknown"], preview_id
+                    )
+
+    safe_insert_props_batch(cur, INSERT_DMX_PROPS_SQL, props_batch)
+    # Legs stream straight from the groups into executemany (no second row list)
+    executemany_chunked(cur, INSERT_DMX_CHANNELS_SQL, _leg_rows())
+
+def process_lor_props(preview_id, lor_props, conn, id_to_prop):
     """
     RULES
     -----
@@ -1734,7 +2042,9 @@ def process_lor_props(preview_id, root):
 
     Inputs
       - preview_id: string id of the <PreviewClass>.
-      - root: XML root (ElementTree).
+      - lor_props: single-grid PropClass nodes with DeviceType "LOR" (props_by_device["LOR"]).
+      - conn: open sqlite3 connection shared by the whole import.
+      - id_to_prop: {PropClass.id: node} for the whole preview (manual MasterPropId lookups).
 
     Outputs
       - Inserts master row into `props`.
@@ -1745,63 +2055,42 @@ def process_lor_props(preview_id, root):
     """
 
     import sqlite3, re
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
 
+    # Rows are queued per preview and flushed with executemany at the end.
+    # GAL 25-10-22: collision-aware insert (no silent overwrite)
+    props_batch = []
+    subprops_batch = []
+
     # --- helpers -------------------------------------------------------------
     def parse_single_grid(channel_grid_text):
         if not channel_grid_text:
             return None
-        parts = [p.strip() for p in channel_grid_text.split(",")]
+        parts = channel_grid_text.split(",", 6)  # 5–6 fields used; anything past Color is ignored
         if len(parts) < 5:
             return None
         return {
-            "Network":      parts[0],
-            "UID":          parts[1] if len(parts) > 1 else None,
-            "StartChannel": safe_int(parts[2]) if len(parts) > 2 else None,
-            "EndChannel":   safe_int(parts[3]) if len(parts) > 3 else None,
-            "Unknown":      parts[4] if len(parts) > 4 else None,
-            "Color":        parts[5] if len(parts) > 5 else None,
+            "Network":      parts[0].strip(),
+            "UID":          parts[1].strip(),
+            "StartChannel": safe_int(parts[2]),
+            "EndChannel":   safe_int(parts[3]),
+            "Unknown":      parts[4].strip(),
+            "Color":        parts[5].strip() if len(parts) > 5 else None,
         }
 
     # -----------------------------------------------------------------------
     # PASS 0: SPARE rows (single-grid) -> props as-is
     # -----------------------------------------------------------------------
-    for prop in root.findall(".//PropClass"):
-        if prop.get("DeviceType") != "LOR":
-            continue
+    for prop in lor_props:
         name = (prop.get("Name") or "")
         ch_raw = (prop.get("ChannelGrid") or "").strip()
-        if ";" in ch_raw:
-            continue  # multi-grid handled elsewhere
         if "spare" in name.lower():
             grid = parse_single_grid(ch_raw) or {}
             raw_id = prop.get("id") or ""
             prop_id_scoped = scoped_id(preview_id, raw_id)
             # Process_LOR_Props PASS 0: SPARE rows (single-grid) -> props as-is
             # GAL 25-10-22: collision-aware insert (no silent overwrite)
-            insert_sql = """
-                INSERT INTO props (
-                    PropID, Name, LORComment, DeviceType, BulbShape, DimmingCurveName, MaxChannels,
-                    CustomBulbColor, IndividualChannels, LegacySequenceMethod, Opacity, MasterDimmable,
-                    PreviewBulbSize, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
-                    EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights,
-                    Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            params = (
-                prop_id_scoped, name, prop.get("Comment", ""), "LOR",
-                prop.get("BulbShape"), prop.get("DimmingCurveName"), prop.get("MaxChannels"),
-                prop.get("CustomBulbColor"), prop.get("IndividualChannels"), prop.get("LegacySequenceMethod"),
-                prop.get("Opacity"), prop.get("MasterDimmable"), prop.get("PreviewBulbSize"),
-                prop.get("SeparateIds"), prop.get("StartLocation"), prop.get("StringType"),
-                prop.get("TraditionalColors"), prop.get("TraditionalType"), prop.get("EffectBulbSize"),
-                prop.get("Tag"), prop.get("Parm1"), prop.get("Parm2"), prop.get("Parm3"), prop.get("Parm4"),
-                prop.get("Parm5"), prop.get("Parm6"), prop.get("Parm7"), prop.get("Parm8"),
-                int(prop.get("Parm2")) if (prop.get("Parm2") and str(prop.get("Parm2")).isdigit()) else 0,
-                grid.get("Network"), grid.get("UID"), grid.get("StartChannel"), grid.get("EndChannel"),
-                grid.get("Unknown"), grid.get("Color"), preview_id
-            )
+            params = _prop_tuple(prop, prop_id_scoped, name, prop.get("Comment", ""), grid, preview_id)
             incoming_ctx = {
                 "PropID":       prop_id_scoped,
                 "Name":         name,
@@ -1813,19 +2102,15 @@ def process_lor_props(preview_id, root):
                 "StartChannel": grid.get("StartChannel", ""),
                 "EndChannel":   grid.get("EndChannel", ""),
             }
-            ok = safe_insert_prop(cursor, insert_sql, params, incoming_ctx)
-            if DEBUG:
-                if ok:
-                    print(f"[DEBUG] (LOR single) SPARE -> props INSERT: {prop_id_scoped} '{name}'")
-                else:
-                    print(f"[DEBUG] (LOR single) SPARE -> props SKIP (collision/error): {prop_id_scoped} '{name}'")
+            debug = ("(LOR single) SPARE -> props", f": {prop_id_scoped} '{name}'") if DEBUG else None
+            props_batch.append((params, incoming_ctx, debug))
 
 
     # -----------------------------------------------------------------------
     # PASS 0B: MANUAL SUBPROPS (MasterPropId set)
     # Materialize full groups when a manual has a *changed* Display_Name.
     # -----------------------------------------------------------------------
-    xml_by_id = {p.get("id"): p for p in root.findall(".//PropClass")}
+    # id_to_prop: {PropClass.id: node} for the whole preview, built once by bucket_prop_nodes()
 
     def grid_or(node, fallback=None):
         g = parse_single_grid((node.get("ChannelGrid") or "").strip())
@@ -1834,16 +2119,11 @@ def process_lor_props(preview_id, root):
     manuals_same = []              # [(sp_node, master_node)]
     changed_by_comment = {}        # { new_display_name: [manual_sp_nodes...] }
 
-    for sp in root.findall(".//PropClass"):
-        if sp.get("DeviceType") != "LOR":
-            continue
-        ch_raw = (sp.get("ChannelGrid") or "").strip()
-        if ";" in ch_raw:
-            continue  # single-grid only here
+    for sp in lor_props:
         m_raw = (sp.get("MasterPropId") or "").strip()
         if not m_raw:
             continue
-        master = xml_by_id.get(m_raw)
+        master = id_to_prop.get(m_raw)
         sub_comment    = (sp.get("Comment") or "").strip()
         master_comment = (master.get("Comment") or "").strip() if master is not None else ""
         if sub_comment == master_comment:
@@ -1858,26 +2138,19 @@ def process_lor_props(preview_id, root):
         g = grid_or(sp, grid_or(master))
         # Process_LOR_Props PASS 0B: MANUAL SUBPROPS (MasterPropId set)
         # GAL 25-10-22: collision-aware insert (no silent overwrite)
-        insert_sql = """
-            INSERT INTO subProps (
-                SubPropID, Name, LORComment, DeviceType, BulbShape, Network, UID, StartChannel,
-                EndChannel, Unknown, Color, CustomBulbColor, DimmingCurveName, IndividualChannels,
-                LegacySequenceMethod, MaxChannels, Opacity, MasterDimmable, PreviewBulbSize, RgbOrder,
-                MasterPropId, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
-                EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights, PreviewId
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+        get = sp.get
+        p2 = get("Parm2")
         params = (
-            sub_id_scoped, sp.get("Name",""), sp.get("Comment",""), "LOR", sp.get("BulbShape"),
+            sub_id_scoped, get("Name",""), get("Comment",""), "LOR", get("BulbShape"),
             g["Network"], g["UID"], g["StartChannel"], g["EndChannel"], g["Unknown"], g["Color"],
-            sp.get("CustomBulbColor"), sp.get("DimmingCurveName"), sp.get("IndividualChannels"),
-            sp.get("LegacySequenceMethod"), sp.get("MaxChannels"), sp.get("Opacity"),
-            sp.get("MasterDimmable"), sp.get("PreviewBulbSize"), None,
-            master_id_scoped, sp.get("SeparateIds"), sp.get("StartLocation"), sp.get("StringType"),
-            sp.get("TraditionalColors"), sp.get("TraditionalType"), sp.get("EffectBulbSize"), sp.get("Tag"),
-            sp.get("Parm1"), sp.get("Parm2"), sp.get("Parm3"), sp.get("Parm4"), sp.get("Parm5"), sp.get("Parm6"),
-            sp.get("Parm7"), sp.get("Parm8"),
-            int(sp.get("Parm2")) if (sp.get("Parm2") and str(sp.get("Parm2")).isdigit()) else 0,
+            get("CustomBulbColor"), get("DimmingCurveName"), get("IndividualChannels"),
+            get("LegacySequenceMethod"), get("MaxChannels"), get("Opacity"),
+            get("MasterDimmable"), get("PreviewBulbSize"), None,
+            master_id_scoped, get("SeparateIds"), get("StartLocation"), get("StringType"),
+            get("TraditionalColors"), get("TraditionalType"), get("EffectBulbSize"), get("Tag"),
+            get("Parm1"), p2, get("Parm3"), get("Parm4"), get("Parm5"), get("Parm6"),
+            get("Parm7"), get("Parm8"),
+            safe_int(p2, 0),
             preview_id
         )
         incoming_ctx = {
@@ -1892,12 +2165,8 @@ def process_lor_props(preview_id, root):
             "EndChannel":   g.get("EndChannel",""),
             "MasterPropId": master_id_scoped,
         }
-        ok = safe_insert_subprop(cursor, insert_sql, params, incoming_ctx)
-        if DEBUG:
-            if ok:
-                print(f"[DEBUG] (LOR manual subprop) INSERT: {sub_id_scoped}  Master='{master_id_scoped}'")
-            else:
-                print(f"[DEBUG] (LOR manual subprop) SKIP (collision/error): {sub_id_scoped}  Master='{master_id_scoped}'")
+        debug = ("(LOR manual subprop)", f": {sub_id_scoped}  Master='{master_id_scoped}'") if DEBUG else None
+        subprops_batch.append((params, incoming_ctx, debug))
 
 
     # For manuals whose Display_Name changed: build FULL group (manual + non-manual) for that Display_Name
@@ -1905,11 +2174,7 @@ def process_lor_props(preview_id, root):
 
     # Pre-index non-manual, single-grid, non-spare rows by Display_Name
     nonmanual_by_comment = {}
-    for node in root.findall(".//PropClass"):
-        if node.get("DeviceType") != "LOR":
-            continue
-        if ";" in (node.get("ChannelGrid") or ""):
-            continue
+    for node in lor_props:
         if (node.get("MasterPropId") or "").strip():
             continue
         if "spare" in (node.get("Name") or "").lower():
@@ -1953,29 +2218,7 @@ def process_lor_props(preview_id, root):
         # Insert new master  Pre-index non-manual, single-grid, non-spare rows by Display_Name
         # Insert new master  Pre-index non-manual, single-grid, non-spare rows by Display_Name
         # GAL 25-10-22: collision-aware insert (no silent overwrite)
-        insert_sql = """
-            INSERT INTO props (
-                PropID, Name, LORComment, DeviceType, BulbShape, DimmingCurveName, MaxChannels,
-                CustomBulbColor, IndividualChannels, LegacySequenceMethod, Opacity, MasterDimmable,
-                PreviewBulbSize, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
-                EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights,
-                Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        params = (
-            new_master_id, new_master.get("Name",""), new_comment, "LOR",
-            new_master.get("BulbShape"), new_master.get("DimmingCurveName"), new_master.get("MaxChannels"),
-            new_master.get("CustomBulbColor"), new_master.get("IndividualChannels"),
-            new_master.get("LegacySequenceMethod"), new_master.get("Opacity"), new_master.get("MasterDimmable"),
-            new_master.get("PreviewBulbSize"), new_master.get("SeparateIds"), new_master.get("StartLocation"),
-            new_master.get("StringType"), new_master.get("TraditionalColors"), new_master.get("TraditionalType"),
-            new_master.get("EffectBulbSize"), new_master.get("Tag"), new_master.get("Parm1"), new_master.get("Parm2"),
-            new_master.get("Parm3"), new_master.get("Parm4"), new_master.get("Parm5"), new_master.get("Parm6"),
-            new_master.get("Parm7"), new_master.get("Parm8"),
-            int(new_master.get("Parm2")) if (new_master.get("Parm2") and str(new_master.get("Parm2")).isdigit()) else 0,
-            g_master["Network"], g_master["UID"], g_master["StartChannel"], g_master["EndChannel"],
-            g_master["Unknown"], g_master["Color"], preview_id
-        )
+        params = _prop_tuple(new_master, new_master_id, new_master.get("Name",""), new_comment, g_master, preview_id)
         incoming_ctx = {
             "PropID":       new_master_id,
             "Name":         new_master.get("Name",""),
@@ -1987,12 +2230,8 @@ def process_lor_props(preview_id, root):
             "StartChannel": g_master.get("StartChannel",""),
             "EndChannel":   g_master.get("EndChannel",""),
         }
-        ok = safe_insert_prop(cursor, insert_sql, params, incoming_ctx)
-        if DEBUG:
-            if ok:
-                print(f"[DEBUG] (LOR master new) -> props INSERT: {new_master_id}  Display='{new_comment}'")
-            else:
-                print(f"[DEBUG] (LOR master new) -> props SKIP (collision/error): {new_master_id}  Display='{new_comment}'")
+        debug = ("(LOR master new) -> props", f": {new_master_id}  Display='{new_comment}'") if DEBUG else None
+        props_batch.append((params, incoming_ctx, debug))
 
         # Everyone else in the group -> subProps under new master
         # Everyone else in the group -> subProps under new master
@@ -2003,26 +2242,19 @@ def process_lor_props(preview_id, root):
             sub_id = scoped_id(preview_id, node.get("id") or "")
 
             # GAL 25-10-22: collision-aware insert (no silent overwrite)
-            insert_sql = """
-                INSERT INTO subProps (
-                    SubPropID, Name, LORComment, DeviceType, BulbShape, Network, UID, StartChannel,
-                    EndChannel, Unknown, Color, CustomBulbColor, DimmingCurveName, IndividualChannels,
-                    LegacySequenceMethod, MaxChannels, Opacity, MasterDimmable, PreviewBulbSize, RgbOrder,
-                    MasterPropId, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
-                    EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights, PreviewId
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
+            get = node.get
+            p2 = get("Parm2")
             params = (
-                sub_id, node.get("Name",""), new_comment, "LOR", node.get("BulbShape"),
+                sub_id, get("Name",""), new_comment, "LOR", get("BulbShape"),
                 g["Network"], g["UID"], g["StartChannel"], g["EndChannel"], g["Unknown"], g["Color"],
-                node.get("CustomBulbColor"), node.get("DimmingCurveName"), node.get("IndividualChannels"),
-                node.get("LegacySequenceMethod"), node.get("MaxChannels"), node.get("Opacity"), node.get("MasterDimmable"),
-                node.get("PreviewBulbSize"), None,
-                new_master_id, node.get("SeparateIds"), node.get("StartLocation"), node.get("StringType"),
-                node.get("TraditionalColors"), node.get("TraditionalType"), node.get("EffectBulbSize"),
-                node.get("Tag"), node.get("Parm1"), node.get("Parm2"), node.get("Parm3"), node.get("Parm4"), node.get("Parm5"),
-                node.get("Parm6"), node.get("Parm7"), node.get("Parm8"),
-                int(node.get("Parm2")) if (node.get("Parm2") and str(node.get("Parm2")).isdigit()) else 0,
+                get("CustomBulbColor"), get("DimmingCurveName"), get("IndividualChannels"),
+                get("LegacySequenceMethod"), get("MaxChannels"), get("Opacity"), get("MasterDimmable"),
+                get("PreviewBulbSize"), None,
+                new_master_id, get("SeparateIds"), get("StartLocation"), get("StringType"),
+                get("TraditionalColors"), get("TraditionalType"), get("EffectBulbSize"),
+                get("Tag"), get("Parm1"), p2, get("Parm3"), get("Parm4"), get("Parm5"),
+                get("Parm6"), get("Parm7"), get("Parm8"),
+                safe_int(p2, 0),
                 preview_id
             )
             incoming_ctx = {
@@ -2037,12 +2269,8 @@ def process_lor_props(preview_id, root):
                 "EndChannel":   g.get("EndChannel",""),
                 "MasterPropId": new_master_id,
             }
-            ok = safe_insert_subprop(cursor, insert_sql, params, incoming_ctx)
-            if DEBUG:
-                if ok:
-                    print(f"[DEBUG] (LOR group sub) -> subProps INSERT: {sub_id}  Master='{new_master_id}' Display='{new_comment}'")
-                else:
-                    print(f"[DEBUG] (LOR group sub) -> subProps SKIP (collision/error): {sub_id}  Master='{new_master_id}' Display='{new_comment}'")
+            debug = ("(LOR group sub) -> subProps", f": {sub_id}  Master='{new_master_id}' Display='{new_comment}'") if DEBUG else None
+            subprops_batch.append((params, incoming_ctx, debug))
 
         materialized_comments.add(new_comment)
 
@@ -2052,9 +2280,7 @@ def process_lor_props(preview_id, root):
     #         Display_Names already materialized in PASS 0B)
     # -----------------------------------------------------------------------
     props_grouped_by_comment = {}
-    for prop in root.findall(".//PropClass"):
-        if prop.get("DeviceType") != "LOR":
-            continue
+    for prop in lor_props:
         name = (prop.get("Name") or "")
         if "spare" in name.lower():
             continue
@@ -2064,42 +2290,41 @@ def process_lor_props(preview_id, root):
         if lor_comment in materialized_comments:
             continue  # already got a master in 0B
         ch_raw = (prop.get("ChannelGrid") or "").strip()
-        if ";" in ch_raw:
-            continue  # single-grid only
-
         grid = parse_single_grid(ch_raw)
         raw_id = prop.get("id") or ""
+        get = prop.get
+        p2 = get("Parm2", "")
         rec = {
             "PropID_raw":    raw_id,
             "PropID_scoped": scoped_id(preview_id, raw_id),
             "Name":          name,
             "DeviceType":    "LOR",
             "LORComment":    lor_comment,
-            "BulbShape":     prop.get("BulbShape", ""),
-            "DimmingCurveName": prop.get("DimmingCurveName", ""),
-            "MaxChannels":   prop.get("MaxChannels"),
-            "CustomBulbColor": prop.get("CustomBulbColor", ""),
-            "IndividualChannels": prop.get("IndividualChannels"),
-            "LegacySequenceMethod": prop.get("LegacySequenceMethod", ""),
-            "Opacity":       prop.get("Opacity"),
-            "MasterDimmable": prop.get("MasterDimmable"),
-            "PreviewBulbSize": prop.get("PreviewBulbSize"),
-            "SeparateIds":   prop.get("SeparateIds"),
-            "StartLocation": prop.get("StartLocation", ""),
-            "StringType":    prop.get("StringType", ""),
-            "TraditionalColors": prop.get("TraditionalColors", ""),
-            "TraditionalType":   prop.get("TraditionalType", ""),
-            "EffectBulbSize":    prop.get("EffectBulbSize"),
-            "Tag":           prop.get("Tag",""),
-            "Parm1":         prop.get("Parm1",""),
-            "Parm2":         prop.get("Parm2",""),
-            "Parm3":         prop.get("Parm3",""),
-            "Parm4":         prop.get("Parm4",""),
-            "Parm5":         prop.get("Parm5",""),
-            "Parm6":         prop.get("Parm6",""),
-            "Parm7":         prop.get("Parm7",""),
-            "Parm8":         prop.get("Parm8",""),
-            "Lights":        int(prop.get("Parm2")) if (prop.get("Parm2") and str(prop.get("Parm2")).isdigit()) else 0,
+            "BulbShape":     get("BulbShape", ""),
+            "DimmingCurveName": get("DimmingCurveName", ""),
+            "MaxChannels":   get("MaxChannels"),
+            "CustomBulbColor": get("CustomBulbColor", ""),
+            "IndividualChannels": get("IndividualChannels"),
+            "LegacySequenceMethod": get("LegacySequenceMethod", ""),
+            "Opacity":       get("Opacity"),
+            "MasterDimmable": get("MasterDimmable"),
+            "PreviewBulbSize": get("PreviewBulbSize"),
+            "SeparateIds":   get("SeparateIds"),
+            "StartLocation": get("StartLocation", ""),
+            "StringType":    get("StringType", ""),
+            "TraditionalColors": get("TraditionalColors", ""),
+            "TraditionalType":   get("TraditionalType", ""),
+            "EffectBulbSize":    get("EffectBulbSize"),
+            "Tag":           get("Tag",""),
+            "Parm1":         get("Parm1",""),
+            "Parm2":         p2,
+            "Parm3":         get("Parm3",""),
+            "Parm4":         get("Parm4",""),
+            "Parm5":         get("Parm5",""),
+            "Parm6":         get("Parm6",""),
+            "Parm7":         get("Parm7",""),
+            "Parm8":         get("Parm8",""),
+            "Lights":        safe_int(p2, 0),
             "Grid":          grid or {},
             "StartChannel":  (grid or {}).get("StartChannel"),
             "PreviewId":     preview_id,
@@ -2155,15 +2380,6 @@ def process_lor_props(preview_id, root):
 
         # MASTER -> props
         # GAL 25-10-22: collision-aware insert (no silent overwrite)
-        insert_sql = """
-            INSERT INTO props (
-                PropID, Name, LORComment, DeviceType, BulbShape, DimmingCurveName, MaxChannels,
-                CustomBulbColor, IndividualChannels, LegacySequenceMethod, Opacity, MasterDimmable,
-                PreviewBulbSize, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
-                EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights,
-                Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
         params = (
             master_id, master["Name"], display_name, master["DeviceType"], master["BulbShape"],
             master["DimmingCurveName"], master["MaxChannels"], master["CustomBulbColor"],
@@ -2187,12 +2403,8 @@ def process_lor_props(preview_id, root):
             "StartChannel": (m_grid_full or {}).get("StartChannel",""),
             "EndChannel":   (m_grid_full or {}).get("EndChannel",""),
         }
-        ok = safe_insert_prop(cursor, insert_sql, params, incoming_ctx)
-        if DEBUG:
-            if ok:
-                print(f"[DEBUG] (LOR single) MASTER -> props INSERT: {master_id} '{display_name}' Start={m_grid_full['StartChannel']}")
-            else:
-                print(f"[DEBUG] (LOR single) MASTER -> props SKIP (collision/error): {master_id} '{display_name}' Start={m_grid_full['StartChannel']}")
+        debug = ("(LOR single) MASTER -> props", f": {master_id} '{display_name}' Start={m_grid_full['StartChannel']}") if DEBUG else None
+        props_batch.append((params, incoming_ctx, debug))
 
         # REMAINING -> subProps
         # REMAINING -> subProps
@@ -2203,15 +2415,6 @@ def process_lor_props(preview_id, root):
             sub_id = scoped_id(preview_id, rec["PropID_raw"])
 
             # GAL 25-10-22: collision-aware insert (no silent overwrite)
-            insert_sql = """
-                INSERT INTO subProps (
-                    SubPropID, Name, LORComment, DeviceType, BulbShape, Network, UID, StartChannel,
-                    EndChannel, Unknown, Color, CustomBulbColor, DimmingCurveName, IndividualChannels,
-                    LegacySequenceMethod, MaxChannels, Opacity, MasterDimmable, PreviewBulbSize, RgbOrder,
-                    MasterPropId, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
-                    EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights, PreviewId
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
             params = (
                 sub_id, rec["Name"], rec["LORComment"], rec["DeviceType"], rec["BulbShape"],
                 g["Network"], g["UID"], g["StartChannel"], g["EndChannel"], g["Unknown"], g["Color"],
@@ -2233,16 +2436,50 @@ def process_lor_props(preview_id, root):
                 "EndChannel":   (g or {}).get("EndChannel",""),
                 "MasterPropId": master_id,
             }
-            ok = safe_insert_subprop(cursor, insert_sql, params, incoming_ctx)
-            if DEBUG:
-                if ok:
-                    print(f"[DEBUG] (LOR single) AUTO -> subProps INSERT: parent={master_id} sub={sub_id} Start={g['StartChannel']}")
-                else:
-                    print(f"[DEBUG] (LOR single) AUTO -> subProps SKIP (collision/error): parent={master_id} sub={sub_id} Start={g['StartChannel']}")
+            debug = ("(LOR single) AUTO -> subProps", f": parent={master_id} sub={sub_id} Start={g['StartChannel']}") if DEBUG else None
+            subprops_batch.append((params, incoming_ctx, debug))
 
 
-    conn.commit()
-    conn.close()
+    safe_insert_props_batch(cursor, INSERT_PROPS_SQL, props_batch)
+    safe_insert_subprops_batch(cursor, INSERT_SUBPROPS_SQL, subprops_batch)
+
+# --- Multi-grid helpers (module level: built once, not per preview call) -----
+def parse_grid(seg):
+    """
+    Parse a single grid segment "Net,UID,Start,End,Unknown,Color?" → dict.
+    Handles both A/C (with Color) and RGB (Color may be empty).
+    """
+    parts = (seg or "").split(",", 6)  # anything past Color is ignored
+    n = len(parts)
+    return {
+        "Network":      parts[0].strip(),
+        "UID":          parts[1].strip() if n > 1 else None,
+        "StartChannel": safe_int(parts[2]) if n > 2 else None,
+        "EndChannel":   safe_int(parts[3]) if n > 3 else None,
+        "Unknown":      parts[4].strip() if n > 4 else None,
+        "Color":        parts[5].strip() if n > 5 else None,
+    }
+
+def uid_sort_key(uid):
+    """
+    Deterministic ordering for UIDs that may be hex ('5F') or decimal.
+    We sort by StartChannel first (elsewhere), then use this as tiebreaker.
+    """
+    if uid is None:
+        return (2, 0)
+    u = uid.strip()
+    try:
+        return (0, int(u, 16))  # hex wins if parseable
+    except Exception:
+        try:
+            return (1, int(u))   # then decimal
+        except Exception:
+            return (2, u)        # then raw string
+
+@lru_cache(maxsize=1024)  # display names repeat across groups/previews
+def first_token(s):
+    s = (s or "").strip()
+    return s.split(" ")[0] if s else ""
 
 # --- GAL 25-11-02: aggregate detection helper (very conservative) ----------
 # GAL 25-11-02 — conservative aggregate detector
@@ -2269,7 +2506,7 @@ def _is_aggregate_unit(device_type: str,
 
 
 
-def process_lor_multiple_channel_grids(preview_id, root):
+def process_lor_multiple_channel_grids(preview_id, lor_multi_props, conn):
     """
     RULES
     -----
@@ -2298,7 +2535,9 @@ def process_lor_multiple_channel_grids(preview_id, root):
 
     Inputs
       - preview_id: string id of the <PreviewClass>.
-      - root: XML root (ElementTree).
+      - lor_multi_props: multi-grid (";" in ChannelGrid) PropClass nodes with DeviceType "LOR"
+        (props_by_device["LOR_MULTI"]).
+      - conn: open sqlite3 connection shared by the whole import.
 
     Outputs
       - Inserts master into `props`; emits one `subProps` row per grid group.
@@ -2307,94 +2546,64 @@ def process_lor_multiple_channel_grids(preview_id, root):
       - This complements process_lor_props(); only one of the two will handle a given prop.
     """
 
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
 
-    def parse_grid(seg):
-        """
-        Parse a single grid segment "Net,UID,Start,End,Unknown,Color?" → dict.
-        Handles both A/C (with Color) and RGB (Color may be empty).
-        """
-        parts = [p.strip() for p in (seg or "").split(",")]
-        return {
-            "Network":      parts[0] if len(parts) > 0 else None,
-            "UID":          parts[1] if len(parts) > 1 else None,
-            "StartChannel": safe_int(parts[2] if len(parts) > 2 else None),
-            "EndChannel":   safe_int(parts[3] if len(parts) > 3 else None),
-            "Unknown":      parts[4] if len(parts) > 4 else None,
-            "Color":        parts[5] if len(parts) > 5 else None,
-        }
-
-    def uid_sort_key(uid):
-        """
-        Deterministic ordering for UIDs that may be hex ('5F') or decimal.
-        We sort by StartChannel first (elsewhere), then use this as tiebreaker.
-        """
-        if uid is None:
-            return (2, 0)
-        u = uid.strip()
-        try:
-            return (0, int(u, 16))  # hex wins if parseable
-        except Exception:
-            try:
-                return (1, int(u))   # then decimal
-            except Exception:
-                return (2, u)        # then raw string
-
-    def first_token(s):
-        s = (s or "").strip()
-        return s.split(" ")[0] if s else ""
+    # Rows are queued per preview and flushed with executemany at the end.
+    props_batch = []
+    subprops_batch = []
 
     # --------------------- collect multi-grid by comment ---------------------
     # We collect *all* LOR PropClass nodes whose ChannelGrid contains ';'
     # (masters and reused children) and flatten every grid entry into a group.
     groups = {}  # LORComment -> list of flat entries
-    for prop in root.findall(".//PropClass"):
-        if prop.get("DeviceType") != "LOR":
-            continue
+    for prop in lor_multi_props:
         ch_raw = (prop.get("ChannelGrid") or "").strip()
-        if ";" not in ch_raw:
-            continue  # single-grid handled by process_lor_props
 
         # GAL 25-10-16: Comment→DisplayName hygiene should match lor_core.validate_display_name()
         comment = prop.get("Comment") or ""
         raw_id  = prop.get("id") or ""
+        # PropClass attributes are the same for every segment: read them once
+        get = prop.get
+        p2 = get("Parm2")
+        common = {
+            "prop":         prop,
+            "raw_id":       raw_id,
+            "Name":         get("Name"),
+            "LORComment":   comment,
+            "BulbShape":    get("BulbShape"),
+            "DimmingCurveName": get("DimmingCurveName"),
+            "MaxChannels":  get("MaxChannels"),
+            "CustomBulbColor": get("CustomBulbColor"),
+            "IndividualChannels": get("IndividualChannels"),
+            "LegacySequenceMethod": get("LegacySequenceMethod"),
+            "Opacity":      get("Opacity"),
+            "MasterDimmable": get("MasterDimmable"),
+            "PreviewBulbSize": get("PreviewBulbSize"),
+            "MasterPropId_attr": get("MasterPropId"),  # original attribute for reference
+            "SeparateIds":  get("SeparateIds"),
+            "StartLocation": get("StartLocation"),
+            "StringType":   get("StringType"),
+            "TraditionalColors": get("TraditionalColors"),
+            "TraditionalType":   get("TraditionalType"),
+            "EffectBulbSize": get("EffectBulbSize"),
+            "Tag":          get("Tag"),
+            "Parm1":        get("Parm1"),
+            "Parm2":        p2,
+            "Parm3":        get("Parm3"),
+            "Parm4":        get("Parm4"),
+            "Parm5":        get("Parm5"),
+            "Parm6":        get("Parm6"),
+            "Parm7":        get("Parm7"),
+            "Parm8":        get("Parm8"),
+            "Lights":       safe_int(p2, 0),
+        }
         # flatten each grid segment
-        for seg in (s.strip() for s in ch_raw.split(";") if s.strip()):
+        for seg in ch_raw.split(";"):
+            seg = seg.strip()
+            if not seg:
+                continue
             g = parse_grid(seg)
-            entry = {
-                "prop":         prop,
-                "raw_id":       raw_id,
-                "Name":         prop.get("Name"),
-                "LORComment":   comment,
-                "BulbShape":    prop.get("BulbShape"),
-                "DimmingCurveName": prop.get("DimmingCurveName"),
-                "MaxChannels":  prop.get("MaxChannels"),
-                "CustomBulbColor": prop.get("CustomBulbColor"),
-                "IndividualChannels": prop.get("IndividualChannels"),
-                "LegacySequenceMethod": prop.get("LegacySequenceMethod"),
-                "Opacity":      prop.get("Opacity"),
-                "MasterDimmable": prop.get("MasterDimmable"),
-                "PreviewBulbSize": prop.get("PreviewBulbSize"),
-                "MasterPropId_attr": prop.get("MasterPropId"),  # original attribute for reference
-                "SeparateIds":  prop.get("SeparateIds"),
-                "StartLocation": prop.get("StartLocation"),
-                "StringType":   prop.get("StringType"),
-                "TraditionalColors": prop.get("TraditionalColors"),
-                "TraditionalType":   prop.get("TraditionalType"),
-                "EffectBulbSize": prop.get("EffectBulbSize"),
-                "Tag":          prop.get("Tag"),
-                "Parm1":        prop.get("Parm1"),
-                "Parm2":        prop.get("Parm2"),
-                "Parm3":        prop.get("Parm3"),
-                "Parm4":        prop.get("Parm4"),
-                "Parm5":        prop.get("Parm5"),
-                "Parm6":        prop.get("Parm6"),
-                "Parm7":        prop.get("Parm7"),
-                "Parm8":        prop.get("Parm8"),
-                "Lights":       int(prop.get("Parm2")) if (prop.get("Parm2") and str(prop.get("Parm2")).isdigit()) else 0,
-                "Grid":         g,  # parsed grid dict
-            }
+            entry = {**common, "Grid": g}  # parsed grid dict
             groups.setdefault(raw_id, []).append(entry)
 
     # ---------------------- process each multi-grid group --------------------
@@ -2478,16 +2687,7 @@ def process_lor_multiple_channel_grids(preview_id, root):
         # Handle a single LOR PropClass that contains MULTIPLE ChannelGrid groups (";"-separated).
         # Keep the original prop as the master; materialize each grid group as its own subProp
         # GAL 25-10-22: collision-aware insert (no silent overwrite)
-        insert_sql = """
-            INSERT INTO props (
-                PropID, Name, LORComment, DeviceType, BulbShape, DimmingCurveName, MaxChannels,
-                CustomBulbColor, IndividualChannels, LegacySequenceMethod, Opacity, MasterDimmable,
-                PreviewBulbSize, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
-                EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights,
-                Network, UID, StartChannel, EndChannel, Unknown, Color, PreviewId
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        # props_row already matches the column order above
+        # props_row already matches the INSERT_PROPS_SQL column order
         params = props_row
 
         # Build a minimal context for clear collision messages
@@ -2509,45 +2709,34 @@ def process_lor_multiple_channel_grids(preview_id, root):
             "EndChannel":   m_grid_full.get("EndChannel", ""),
         }
 
-        ok = safe_insert_prop(cursor, insert_sql, params, incoming_ctx)
+        debug = None
         if DEBUG:
             start = m_grid_full.get("StartChannel")
             uid   = m_grid_full.get("UID")
-            if ok:
-                print(f"[DEBUG] (LOR multi) MASTER → props INSERT id={master_id}  comment={comment}  start={start} uid={uid}")
-            else:
-                print(f"[DEBUG] (LOR multi) MASTER → props SKIP (collision/error) id={master_id}  comment={comment}  start={start} uid={uid}")
+            debug = ("(LOR multi) MASTER → props", f" id={master_id}  comment={comment}  start={start} uid={uid}")
+        props_batch.append((params, incoming_ctx, debug))
 
         # Insert remaining grids into subProps
         # Insert remaining grids into subProps (skip for aggregate one-plug RGB/RGBW)
         if not is_aggregate:
             lor_first = first_token(comment)
+            master_prefix = f"{master_id}-"
             for d in items_sorted[1:]:
                 g = d["Grid"]
                 uid   = g["UID"]
+                color = g["Color"]
                 start = g["StartChannel"] if g["StartChannel"] is not None else 0
-                sub_id = f"{master_id}-{uid}-{start:02d}"   # unique under this master/preview
+                sub_id = f"{master_prefix}{uid}-{start:02d}"   # unique under this master/preview
 
                 # Subprop name pattern: "<first-token-of-LORComment> <Color?> <UID>-<Start:02d>"
-                name_parts = [lor_first]
-                if g["Color"]:
-                    name_parts.append(g["Color"])
-                if uid is not None:
-                    name_parts.append(f"{uid}-{start:02d}")
-                sub_name = " ".join(name_parts).strip()
-
-                insert_sql = """
-                    INSERT INTO subProps (
-                        SubPropID, Name, LORComment, DeviceType, BulbShape, Network, UID, StartChannel,
-                        EndChannel, Unknown, Color, CustomBulbColor, DimmingCurveName, IndividualChannels,
-                        LegacySequenceMethod, MaxChannels, Opacity, MasterDimmable, PreviewBulbSize, RgbOrder,
-                        MasterPropId, SeparateIds, StartLocation, StringType, TraditionalColors, TraditionalType,
-                        EffectBulbSize, Tag, Parm1, Parm2, Parm3, Parm4, Parm5, Parm6, Parm7, Parm8, Lights, PreviewId
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """
+                sub_name = (
+                    f"{lor_first}{' ' + color if color else ''}"
+                    f"{f' {uid}-{start:02d}' if uid is not None else ''}"
+                ).strip()
+
                 params = (
                     sub_id, sub_name, comment, "LOR", d["BulbShape"],
-                    g["Network"], uid, g["StartChannel"], g["EndChannel"], g["Unknown"], g["Color"],
+                    g["Network"], uid, g["StartChannel"], g["EndChannel"], g["Unknown"], color,
                     d["CustomBulbColor"], d["DimmingCurveName"], d["IndividualChannels"], d["LegacySequenceMethod"],
                     d["MaxChannels"], d["Opacity"], d["MasterDimmable"], d["PreviewBulbSize"], None,  # RgbOrder=NULL
                     master_id, d["SeparateIds"], d["StartLocation"], d["StringType"], d["TraditionalColors"],
@@ -2567,37 +2756,56 @@ def process_lor_multiple_channel_grids(preview_id, root):
                     "MasterPropId": master_id,
                 }
 
-                ok = safe_insert_subprop(cursor, insert_sql, params, incoming_ctx)
-                if DEBUG:
-                    if ok:
-                        print(f"[DEBUG] (LOR multi) SUB  → subProps INSERT id={sub_id}  parent={master_id}  start={g['StartChannel']} uid={uid}")
-                    else:
-                        print(f"[DEBUG] (LOR multi) SUB  → subProps SKIP (collision/error) id={sub_id}  parent={master_id}  start={g['StartChannel']} uid={uid}")
+                debug = ("(LOR multi) SUB  → subProps", f" id={sub_id}  parent={master_id}  start={g['StartChannel']} uid={uid}") if DEBUG else None
+                subprops_batch.append((params, incoming_ctx, debug))
         else:
             if DEBUG:
                 print(f"[DEBUG] (LOR multi) aggregate skip subProps → {comment}  legs={leg_count}")
 
-    conn.commit()
-    conn.close()
+    safe_insert_props_batch(cursor, INSERT_PROPS_SQL, props_batch)
+    safe_insert_subprops_batch(cursor, INSERT_SUBPROPS_SQL, subprops_batch)
 
 
 
 
-def process_file(file_path):
-    """Process a single .lorprev file."""
-    dprint(f"[DEBUG] Processing file: {file_path}")  # quieter unless DEBUG=True
-    preview = locate_preview_class_deep(file_path)
-    if preview is not None:
+# --- Parallel parse, single writer --------------------------------------------
+# XML parsing runs in worker processes; every DB write stays in the main process,
+# in sorted file order, so collision detection sees the same DB state as a serial run.
+PARSE_WORKERS = os.cpu_count() or 1  # 1 → parse in-process (no pool)
+
+def parse_preview_file(file_path):
+    """
+    Worker half of the import (no DB access): parse one .lorprev and return
+    [(preview_data, prop_nodes)] for its first PreviewClass, or [] if it has none.
+    prop_nodes holds every PropClass's attributes as a plain dict, in document order.
+    Dicts pickle back to the main process and answer the same .get() calls the
+    process_* handlers make on elements.
+    """
+    parsed = []
+    # Single streaming parse (see locate_preview_class_deep)
+    for preview, prop_nodes in locate_preview_class_deep(file_path):
         preview_data = process_preview(preview)   # full dict dump is now gated by PREVIEW_DEBUG inside process_preview
-        insert_preview_data(preview_data)
+        parsed.append((preview_data, prop_nodes))
+    return parsed
+
+def process_file(file_path, conn, parsed=None):
+    """
+    Write one .lorprev file using the shared import connection.
+    parsed: parse_preview_file() result when already parsed by a worker; parsed here if None.
+    """
+    dprint(f"[DEBUG] Processing file: {file_path}")  # quieter unless DEBUG=True
+    if parsed is None:
+        parsed = parse_preview_file(file_path)
 
-        # Parse and process DeviceType == None and DMX props
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+    for preview_data, prop_nodes in parsed:
+        insert_preview_data(preview_data, conn)
+
+        # One walk of the preview; handlers get their DeviceType bucket
+        props_by_device, id_to_prop = bucket_prop_nodes(prop_nodes)
 
         # --- Count unique Displays (by PropClass/@Comment) for a concise summary ---
         display_names = set()
-        for node in root.findall(".//PropClass"):
+        for node in prop_nodes:
             c = (node.get("Comment") or "").strip()
             if c:
                 display_names.add(c)
@@ -2619,26 +2827,28 @@ def process_file(file_path):
                 dprint(f"    - {dn}")
 
         # Pre-scan: which display names should be owned by LOR/DMX/manual wiring?
-        channel_names = collect_channel_display_names(root)
+        channel_names = collect_channel_display_names(prop_nodes)
 
         # Process in the same order, but let process_none_props skip channel-owned names
         # process_none_props(preview_data["id"], root)
 
         # None props: skip anything that will be owned by LOR/DMX/manual wiring GAL 25-09-20
-        process_none_props(preview_data["id"], root, skip_display_names=channel_names)
+        process_none_props(preview_data["id"], props_by_device["None"], conn, skip_display_names=channel_names)
 
         # DMX/LOR unchanged
-        process_dmx_props(preview_data["id"], root)
-        process_lor_props(preview_data["id"], root)
-        process_lor_multiple_channel_grids(preview_data["id"], root)
-    else:
+        process_dmx_props(preview_data["id"], props_by_device["DMX"], conn)
+        process_lor_props(preview_data["id"], props_by_device["LOR"], conn, id_to_prop)
+        process_lor_multiple_channel_grids(preview_data["id"], props_by_device["LOR_MULTI"], conn)
+
+    if not parsed:
         WARN(f"No <PreviewClass> found in {file_path}")
 
 
-def process_folder(folder_path):
-    """Process all .lorprev files in the specified folder."""
-    files = os.listdir(folder_path)
-    lorprevs = [f for f in files if f.lower().endswith(".lorprev")]
+def process_folder(folder_path, conn):
+    """Process all .lorprev files in the specified folder over one connection."""
+    # One directory read; DirEntry.path already joins folder + name
+    with os.scandir(folder_path) as it:
+        lorprevs = sorted((e for e in it if e.name.lower().endswith(".lorprev")), key=lambda e: e.name)
 
     print(f"[INFO] Found {len(lorprevs)} .lorprev files in: {folder_path}")
 
@@ -2646,9 +2856,25 @@ def process_folder(folder_path):
         print(f"[WARNING] No .lorprev files found in folder: {folder_path}")
         return
 
-    for file_name in sorted(lorprevs):
-        file_path = os.path.join(folder_path, file_name)
-        process_file(file_path)
+    file_paths = [e.path for e in lorprevs]
+    workers = min(PARSE_WORKERS, len(file_paths))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        # map() yields results in submission order, so writes keep sorted file order
+        parsed_files = pool.map(parse_preview_file, file_paths) if pool else map(parse_preview_file, file_paths)
+        for file_path, parsed in zip(file_paths, parsed_files):
+            # One transaction per preview file: the preview row and every handler's
+            # inserts commit together (or roll back together on error).
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                process_file(file_path, conn, parsed)
+            except BaseException:  # SystemExit from the duplicate-master guardrail too
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
 
 def collapse_duplicate_masters(db_file: str):
     """
@@ -2657,7 +2883,7 @@ def collapse_duplicate_masters(db_file: str):
       - demote all other PROPs in that group to subProps under the canonical master
     """
     import sqlite3
-    conn = sqlite3.connect(db_file)
+    conn = open_db(db_file)
     try:
         sql = r"""
         -- Build canon from PROPs (exclude blank/SPARE)
@@ -2926,11 +3152,17 @@ def main():
     # ---------------------------------------------------------------------
     validate_previews(PREVIEW_PATH)
 
-    # Set up the database
-    setup_database()
+    # One connection for the whole import (schema + every preview file).
+    # Closed before the post-processing steps below, which open their own.
+    conn = open_import_connection(DB_FILE)
+    try:
+        # Set up the database
+        setup_database(conn)
 
-    # Process all files in the folder
-    process_folder(PREVIEW_PATH)
+        # Process all files in the folder
+        process_folder(PREVIEW_PATH, conn)
+    finally:
+        close_import_connection(conn)
 
     # Collapse any duplicate masters first (this fixes the CarCounterDS/PS case)
     collapse_duplicate_masters(DB_FILE)
@@ -3175,7 +3407,7 @@ WHERE ConnectionType = 'FIELD';
 """
 
     # --- Connect and pre-drop the views we are about to create ----------------
-    conn = sqlite3.connect(db_file)
+    conn = open_db(db_file)
     try:
         full_script = ddl_wiring + "\n" + helpers
 